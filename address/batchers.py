@@ -0,0 +1,106 @@
+"""
+Request-coalescing batchers for address lookups
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Dict, List, Set
+
+from asgiref.sync import sync_to_async
+
+from .models import State
+
+
+class _Batch:
+    """
+    Lookups waiting on one event loop
+    """
+
+    def __init__(self):
+        self.pending: Dict[int, List[asyncio.Future]] = {}
+        self.flush_handle = None
+        # The loop only keeps weak references to tasks, so in-flight dispatches are held here
+        self.dispatch_tasks: Set[asyncio.Task] = set()
+
+
+class StateBatcher:
+    """
+    Coalesce concurrent states-by-country lookups into a single query.
+
+    Calls to `load` arriving within `window` seconds of each other (or until
+    `max_batch_size` distinct countries are pending) are answered by one
+    `State.objects.filter(country_id__in=...)` query, with results fanned back
+    out to every awaiting caller. Batches never span event loops, so callers on
+    different loops (e.g. one per thread) are batched independently.
+    """
+
+    def __init__(self, window: float = 0.005, max_batch_size: int = 100):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        # Futures belong to the loop that created them, so each event loop batches separately
+        self._batches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Batch]" = weakref.WeakKeyDictionary()
+        self._batches_lock = threading.Lock()
+
+    def _get_batch(self, loop: asyncio.AbstractEventLoop) -> "_Batch":
+        """Get the pending batch for an event loop"""
+        with self._batches_lock:
+            batch = self._batches.get(loop)
+            if batch is None:
+                batch = self._batches[loop] = _Batch()
+            return batch
+
+    async def load(self, country_id: int) -> List[Dict]:
+        """Get states for a country, batched with concurrent callers on the same event loop"""
+        loop = asyncio.get_running_loop()
+        batch = self._get_batch(loop)
+        future = loop.create_future()
+        batch.pending.setdefault(country_id, []).append(future)
+
+        if len(batch.pending) >= self.max_batch_size:
+            self._flush(batch)
+        elif batch.flush_handle is None:
+            batch.flush_handle = loop.call_later(self.window, self._flush, batch)
+
+        return await future
+
+    def _flush(self, batch: "_Batch"):
+        """Dispatch everything pending in a batch as one query"""
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+            batch.flush_handle = None
+
+        pending, batch.pending = batch.pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._dispatch(pending))
+            batch.dispatch_tasks.add(task)
+            task.add_done_callback(batch.dispatch_tasks.discard)
+
+    async def _dispatch(self, pending: Dict[int, List[asyncio.Future]]):
+        """Run the batched query and resolve each caller's future"""
+        try:
+            states_by_country = await sync_to_async(self._fetch)(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for country_id, futures in pending.items():
+            states = states_by_country[country_id]
+            for future in futures:
+                if not future.done():
+                    future.set_result(states)
+
+    @staticmethod
+    def _fetch(country_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Get states for many countries, grouped by country ID"""
+        grouped = {country_id: [] for country_id in country_ids}
+        states = State.objects.filter(country_id__in=country_ids).values("id", "name", "country_id").order_by("name")
+        for state in states:
+            grouped[state["country_id"]].append(state)
+        return grouped
+
+
+state_batcher = StateBatcher()
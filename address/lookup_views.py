@@ -2,20 +2,24 @@
 Address lookup and utility views
 """
 
+from adrf.decorators import api_view as async_api_view
+from asgiref.sync import sync_to_async
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from core.renderers import ORJSONRenderer
+
 from .serializers import (
     AddressValidationSerializer,
     CityLookupSerializer,
     CountryLookupSerializer,
     StateLookupSerializer,
 )
-from .services import AddressLookupService, AddressService
+from .services import AddressLookupService, address_service
 
 
 @extend_schema(
@@ -27,13 +31,14 @@ from .services import AddressLookupService, AddressService
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_countries(request):
+@renderer_classes([ORJSONRenderer])
+async def get_countries(request):
     """
     Get all countries for address lookups
     """
-    countries = AddressLookupService.get_countries()
+    countries = await AddressLookupService.aget_countries()
     return Response(countries)
 
 
@@ -55,9 +60,10 @@ def get_countries(request):
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_states_by_country(request):
+@renderer_classes([ORJSONRenderer])
+async def get_states_by_country(request):
     """
     Get states by country ID
     """
@@ -66,7 +72,7 @@ def get_states_by_country(request):
         return Response({"error": "country_id parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        states = AddressLookupService.get_states_by_country(int(country_id))
+        states = await AddressLookupService.aget_states_by_country(int(country_id))
         return Response(states)
     except ValueError:
         return Response({"error": "Invalid country_id"}, status=status.HTTP_400_BAD_REQUEST)
@@ -90,9 +96,10 @@ def get_states_by_country(request):
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_cities_by_state(request):
+@renderer_classes([ORJSONRenderer])
+async def get_cities_by_state(request):
     """
     Get cities by state ID
     """
@@ -101,7 +108,7 @@ def get_cities_by_state(request):
         return Response({"error": "state_id parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        cities = AddressLookupService.get_cities_by_state(int(state_id))
+        cities = await AddressLookupService.aget_cities_by_state(int(state_id))
         return Response(cities)
     except ValueError:
         return Response({"error": "Invalid state_id"}, status=status.HTTP_400_BAD_REQUEST)
@@ -145,9 +152,10 @@ def get_cities_by_state(request):
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def search_locations(request):
+@renderer_classes([ORJSONRenderer])
+async def search_locations(request):
     """
     Search across all location types
     """
@@ -157,7 +165,7 @@ def search_locations(request):
     if len(query) < 2:
         return Response({"results": []})
 
-    results = AddressLookupService.search_locations(query, limit)
+    results = await AddressLookupService.asearch_locations(query, limit)
     return Response({"results": results})
 
 
@@ -188,18 +196,18 @@ def search_locations(request):
     },
     tags=["addresses"],
 )
-@api_view(["POST"])
+@async_api_view(["POST"])
 @permission_classes([AllowAny])
-def validate_address(request):
+async def validate_address(request):
     """
     Validate address data
     """
     serializer = AddressValidationSerializer(data=request.data)
-    if not serializer.is_valid():
+    # Field validators query the database, so run them off the event loop
+    if not await sync_to_async(serializer.is_valid)():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    service = AddressService()
-    result = service.validate_address(serializer.validated_data)
+    result = await address_service.avalidate_address(serializer.validated_data)
 
     return Response(result)
 
@@ -256,13 +264,13 @@ def validate_address(request):
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_address_hierarchy(request):
+@renderer_classes([ORJSONRenderer])
+async def get_address_hierarchy(request):
     """
     Get complete address hierarchy
     """
-    service = AddressService()
     country_id = request.query_params.get("country_id")
     state_id = request.query_params.get("state_id")
 
@@ -271,7 +279,7 @@ def get_address_hierarchy(request):
     if state_id:
         state_id = int(state_id)
 
-    hierarchy = service.get_address_hierarchy(country_id, state_id)
+    hierarchy = await address_service.aget_address_hierarchy(country_id, state_id)
     return Response(hierarchy)
 
 
@@ -293,12 +301,11 @@ def get_address_hierarchy(request):
     },
     tags=["addresses"],
 )
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_address_statistics(request):
+async def get_address_statistics(request):
     """
     Get address statistics
     """
-    service = AddressService()
-    stats = service.get_address_statistics()
+    stats = await address_service.aget_address_statistics()
     return Response(stats)
@@ -1,16 +1,44 @@
 """
 Management command to manually populate address app with custom data.
 Usage: python manage.py populate_address [--country=COUNTRY] [--state=STATE] [--city=CITY] [--location=LOCATION] [--zip-code=ZIP] [--interactive]
+       cat addresses.ndjson | python manage.py populate_address --stdin-json
 """
 
+import functools
 import json
+import sys
 
+import orjson
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from jsonschema import Draft7Validator
 
 from address.models import Address, City, Country, State
-from address.services import AddressService
+from address.services import address_service, invalidate_lookup_cache
+
+# Schema for one address record, compiled once at import for --stdin-json and --json-file payloads
+ADDRESS_RECORD_SCHEMA = {
+    "type": "object",
+    "required": ["country_name", "state_name", "city_name", "location", "zip_code"],
+    "properties": {
+        "country_name": {"type": "string", "minLength": 1},
+        "country_code": {"type": ["string", "null"]},
+        "state_name": {"type": "string", "minLength": 1},
+        "city_name": {"type": "string", "minLength": 1},
+        "location": {"type": "string", "minLength": 1},
+        "zip_code": {"type": "string", "minLength": 1},
+        "content_type": {"type": ["string", "null"]},
+        "object_id": {"type": ["integer", "null"]},
+    },
+}
+ADDRESS_RECORD_VALIDATOR = Draft7Validator(ADDRESS_RECORD_SCHEMA)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_content_type_id():
+    """Get the ID of the first available content type, used when none is given"""
+    return ContentType.objects.values_list("id", flat=True).first()
 
 
 class Command(BaseCommand):
@@ -57,6 +85,11 @@ class Command(BaseCommand):
             type=str,
             help="Path to JSON file containing address data",
         )
+        parser.add_argument(
+            "--stdin-json",
+            action="store_true",
+            help="Read address data (a JSON object, array, or newline-delimited objects) from stdin",
+        )
         parser.add_argument(
             "--content-type",
             type=str,
@@ -74,12 +107,14 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        self.address_service = AddressService()
+        self.address_service = address_service
 
         if options["interactive"]:
             self.run_interactive_mode()
+        elif options["stdin_json"]:
+            self.run_stdin_json_mode(options["dry_run"])
         elif options["json_file"]:
-            self.run_json_file_mode(options["json_file"])
+            self.run_json_file_mode(options["json_file"], options["dry_run"])
         else:
             self.run_command_line_mode(options)
 
@@ -119,23 +154,198 @@ class Command(BaseCommand):
 
         self.create_address_from_data(address_data)
 
-    def run_json_file_mode(self, json_file_path):
-        """Run with data from JSON file"""
+    def run_json_file_mode(self, json_file_path, dry_run=False):
+        """Run with data from JSON file, validated against the address record schema"""
         try:
-            with open(json_file_path, "r") as f:
-                data = json.load(f)
-
-            if isinstance(data, list):
-                for address_data in data:
-                    self.create_address_from_data(address_data)
-            else:
-                self.create_address_from_data(data)
+            with open(json_file_path, "rb") as f:
+                data = orjson.loads(f.read())
 
         except FileNotFoundError:
             raise CommandError(f"JSON file not found: {json_file_path}")
         except json.JSONDecodeError as e:
             raise CommandError(f"Invalid JSON file: {e}")
 
+        records = data if isinstance(data, list) else [data]
+        self.validate_records(records, f"in {json_file_path}")
+
+        if dry_run:
+            self.show_dry_run_records(records)
+        else:
+            self.create_addresses_in_bulk(records)
+
+    def run_stdin_json_mode(self, dry_run=False):
+        """Run with data piped on stdin, validated against the address record schema"""
+        payload = sys.stdin.buffer.read()
+        try:
+            data = orjson.loads(payload)
+        except json.JSONDecodeError:
+            try:
+                data = [orjson.loads(line) for line in payload.splitlines() if line.strip()]
+            except json.JSONDecodeError as e:
+                raise CommandError(f"Invalid JSON on stdin: {e}")
+
+        records = data if isinstance(data, list) else [data]
+        self.validate_records(records, "on stdin")
+
+        if dry_run:
+            self.show_dry_run_records(records)
+        elif len(records) == 1:
+            self.create_address_from_data(records[0])
+        else:
+            self.create_addresses_in_bulk(records)
+
+    def validate_records(self, records, source):
+        """Validate every record against the address record schema, reporting all errors at once"""
+        errors = [
+            f"record {index}: {error.message}"
+            for index, record in enumerate(records)
+            for error in ADDRESS_RECORD_VALIDATOR.iter_errors(record)
+        ]
+        if errors:
+            raise CommandError(f"Invalid address data {source}:\n" + "\n".join(errors))
+
+    def create_addresses_in_bulk(self, records):
+        """Create addresses from many records with a fixed number of queries per level"""
+        try:
+            with transaction.atomic():
+                countries = self.bulk_get_or_create_countries(records)
+                states = self.bulk_get_or_create_states(records, countries)
+                cities = self.bulk_get_or_create_cities(records, countries, states)
+                content_types = self.resolve_content_types(records)
+
+                addresses = {}
+                for record in records:
+                    country = countries[self.get_country_key(record)]
+                    state = states[(record["state_name"], country.id)]
+                    city = cities[(record["city_name"], state.id)]
+                    content_type_id = None
+                    if record.get("content_type") and record.get("object_id"):
+                        content_type_id = content_types.get(record["content_type"])
+                    address = Address(
+                        location=record["location"],
+                        city=city,
+                        state=state,
+                        country=country,
+                        zip_code=record["zip_code"],
+                        content_type_id=content_type_id or _default_content_type_id(),
+                        object_id=record.get("object_id") or 1,
+                        city_name=city.name,
+                        state_name=state.name,
+                        country_name=country.name,
+                        country_code=country.code,
+                    )
+                    # bulk_create skips save(), so fill the denormalized address here
+                    address.full_address = address.build_full_address()
+                    # Repeated records in the input collapse onto their uniq_address key
+                    addresses.setdefault(self.get_address_key(address), address)
+
+                existing = self.fetch_existing_address_keys(addresses.values())
+                new_addresses = [address for key, address in addresses.items() if key not in existing]
+                skipped = len(records) - len(new_addresses)
+
+                # ignore_conflicts covers rows committed by a concurrent import since the lookup above
+                Address.objects.bulk_create(new_addresses, batch_size=1000, ignore_conflicts=True)
+                # bulk_create sends no post_save for the new countries, states and cities,
+                # so drop the cached lookups once this commits
+                transaction.on_commit(invalidate_lookup_cache)
+
+        except Exception as e:
+            raise CommandError(f"Error creating addresses: {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully created {len(new_addresses)} addresses"))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped {skipped} duplicate addresses"))
+        return new_addresses
+
+    def get_address_key(self, address):
+        """Get the uniq_address key of an address"""
+        return (address.content_type_id, address.object_id, address.city_id, address.location, address.zip_code)
+
+    def fetch_existing_address_keys(self, addresses):
+        """Get the uniq_address keys of stored addresses that match any of the given addresses"""
+        addresses = list(addresses)
+        if not addresses:
+            return set()
+        existing = Address.objects.filter(
+            city_id__in={address.city_id for address in addresses},
+            zip_code__in={address.zip_code for address in addresses},
+        ).values_list("content_type_id", "object_id", "city_id", "location", "zip_code")
+        return set(existing.iterator(chunk_size=1000))
+
+    def get_country_key(self, record):
+        """Get the country code for a record, generating one from the name if not provided"""
+        return record.get("country_code") or record["country_name"].upper().replace(" ", "")[:10]
+
+    def bulk_get_or_create_countries(self, records):
+        """Get or create all countries referenced by the records, keyed by code"""
+        names_by_code = {self.get_country_key(record): record["country_name"] for record in records}
+        countries = Country.objects.in_bulk(list(names_by_code), field_name="code")
+
+        # Records without a code match existing countries by name, as in get_or_create_country
+        codeless_names = {record["country_name"] for record in records if not record.get("country_code")}
+        if codeless_names:
+            by_name = {country.name: country for country in Country.objects.filter(name__in=codeless_names)}
+            for record in records:
+                if not record.get("country_code") and record["country_name"] in by_name:
+                    countries.setdefault(self.get_country_key(record), by_name[record["country_name"]])
+
+        missing = [Country(name=name, code=code) for code, name in names_by_code.items() if code not in countries]
+        if missing:
+            Country.objects.bulk_create(missing, ignore_conflicts=True)
+            countries.update(Country.objects.in_bulk([country.code for country in missing], field_name="code"))
+            self.stdout.write(f"Created {len(missing)} countries")
+
+        return countries
+
+    def bulk_get_or_create_states(self, records, countries):
+        """Get or create all states referenced by the records, keyed by (name, country_id)"""
+        wanted = {(record["state_name"], countries[self.get_country_key(record)].id) for record in records}
+        states = self.fetch_by_name_and_parent(State, "country_id", wanted)
+
+        missing = [State(name=name, country_id=country_id) for name, country_id in wanted - states.keys()]
+        if missing:
+            State.objects.bulk_create(missing)
+            states = self.fetch_by_name_and_parent(State, "country_id", wanted)
+            self.stdout.write(f"Created {len(missing)} states")
+
+        return states
+
+    def bulk_get_or_create_cities(self, records, countries, states):
+        """Get or create all cities referenced by the records, keyed by (name, state_id)"""
+        wanted = set()
+        for record in records:
+            country_id = countries[self.get_country_key(record)].id
+            wanted.add((record["city_name"], states[(record["state_name"], country_id)].id))
+        cities = self.fetch_by_name_and_parent(City, "state_id", wanted)
+
+        missing = [City(name=name, state_id=state_id) for name, state_id in wanted - cities.keys()]
+        if missing:
+            City.objects.bulk_create(missing)
+            cities = self.fetch_by_name_and_parent(City, "state_id", wanted)
+            self.stdout.write(f"Created {len(missing)} cities")
+
+        return cities
+
+    def fetch_by_name_and_parent(self, model, parent_field, keys):
+        """Fetch model rows matching (name, parent_id) pairs in a single query"""
+        names = {name for name, _ in keys}
+        parent_ids = {parent_id for _, parent_id in keys}
+        rows = model.objects.filter(name__in=names, **{f"{parent_field}__in": parent_ids})
+        found = {}
+        for row in rows:
+            key = (row.name, getattr(row, parent_field))
+            if key in keys:
+                found.setdefault(key, row)
+        return found
+
+    def resolve_content_types(self, records):
+        """Resolve content type names used by the records to their IDs"""
+        names = {record["content_type"] for record in records if record.get("content_type") and record.get("object_id")}
+        content_types = dict(ContentType.objects.filter(model__in=names).values_list("model", "id"))
+        for name in names - content_types.keys():
+            self.stdout.write(self.style.WARNING(f'Content type "{name}" not found. Using default.'))
+        return content_types
+
     def run_command_line_mode(self, options):
         """Run with command line arguments"""
         # Validate required fields
@@ -196,7 +406,7 @@ class Command(BaseCommand):
                 city = self.get_or_create_city(address_data["city_name"], state)
 
                 # Create address
-                address = self.create_address(
+                address, created = self.create_address(
                     address_data["location"],
                     city,
                     address_data["zip_code"],
@@ -204,11 +414,18 @@ class Command(BaseCommand):
                     address_data.get("object_id"),
                 )
 
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully created address: {address.location}, " f"{city.name}, {state.name}, {country.name}"
+                if created:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Successfully created address: {address.location}, " f"{city.name}, {state.name}, {country.name}"
+                        )
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"Skipped existing address: {address.location}, " f"{city.name}, {state.name}, {country.name}"
+                        )
                     )
-                )
 
                 return address
 
@@ -254,33 +471,29 @@ class Command(BaseCommand):
         return city
 
     def create_address(self, location, city, zip_code, content_type_name=None, object_id=None):
-        """Create address"""
+        """Get or create address, returning (address, created)"""
         # Set up content type and object_id if provided
-        content_type = None
+        content_type_id = None
         if content_type_name and object_id:
-            try:
-                content_type = ContentType.objects.get(model=content_type_name)
-            except ContentType.DoesNotExist:
+            content_type_id = ContentType.objects.filter(model=content_type_name).values_list("id", flat=True).first()
+            if content_type_id is None:
                 self.stdout.write(self.style.WARNING(f'Content type "{content_type_name}" not found. Using default.'))
 
         # Use default values if not provided
-        if not content_type:
-            content_type = ContentType.objects.first()  # Use first available content type
+        if not content_type_id:
+            content_type_id = _default_content_type_id()
         if not object_id:
             object_id = 1  # Default object ID
 
-        address = Address.objects.create(
+        return Address.objects.get_or_create(
             location=location,
             city=city,
-            state=city.state,
-            country=city.state.country,
             zip_code=zip_code,
-            content_type=content_type,
+            content_type_id=content_type_id,
             object_id=object_id,
+            defaults={"state": city.state, "country": city.state.country},
         )
 
-        return address
-
     def show_dry_run(self, address_data):
         """Show what would be created in dry run mode"""
         self.stdout.write(self.style.WARNING("DRY RUN - No data will be created"))
@@ -295,6 +508,11 @@ class Command(BaseCommand):
         if address_data.get("object_id"):
             self.stdout.write(f'  Object ID: {address_data["object_id"]}')
 
+    def show_dry_run_records(self, records):
+        """Show what would be created for each record in dry run mode"""
+        for address_data in records:
+            self.show_dry_run(address_data)
+
     def validate_address_data(self, address_data):
         """Validate address data using the address service"""
         validation_data = {
@@ -0,0 +1,46 @@
+# Generated manually to add trigram and prefix indexes for location search
+
+from django.db import migrations
+
+NAME_INDEXED_TABLES = ("address_country", "address_state", "address_city")
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create pg_trgm GIN and lower(name) prefix indexes (PostgreSQL only)"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table in NAME_INDEXED_TABLES:
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_name_trgm ON {table} USING gin (name gin_trgm_ops)"
+            )
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_name_prefix "
+                f"ON {table} (lower(name) varchar_pattern_ops)"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    """Drop the location search indexes"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in NAME_INDEXED_TABLES:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_name_trgm")
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_name_prefix")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('address', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
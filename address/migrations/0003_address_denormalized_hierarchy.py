@@ -0,0 +1,67 @@
+# Generated manually to denormalize the city/state/country hierarchy onto Address
+
+from django.db import migrations, models
+
+
+def backfill_denormalized_fields(apps, schema_editor):
+    """Populate the denormalized hierarchy columns for existing addresses
+
+    The state and country keys are realigned with the city too, since the
+    denormalized names are copied from the city's hierarchy.
+    """
+    Address = apps.get_model('address', 'Address')
+
+    addresses = list(Address.objects.select_related('city__state__country'))
+    for address in addresses:
+        country = address.city.state.country
+        address.state_id = address.city.state_id
+        address.country_id = country.id
+        address.city_name = address.city.name
+        address.state_name = address.city.state.name
+        address.country_name = country.name
+        address.country_code = country.code
+        address.full_address = (
+            f"{address.location}, {address.city_name}, {address.state_name}, {address.country_name} {address.zip_code}"
+        )
+
+    Address.objects.bulk_update(
+        addresses,
+        ['state', 'country', 'city_name', 'state_name', 'country_name', 'country_code', 'full_address'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0002_location_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='city_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='state_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='country_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='country_code',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='full_address',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(backfill_denormalized_fields, migrations.RunPython.noop),
+    ]
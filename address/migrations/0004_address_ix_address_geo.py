@@ -0,0 +1,17 @@
+# Generated manually to add a composite geo index on Address
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0003_address_denormalized_hierarchy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['country', 'state', 'city'], name='ix_address_geo'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated manually to add trigram indexes for address location/zip code substring filters
+
+from django.db import migrations
+
+TRIGRAM_INDEXED_COLUMNS = ("location", "zip_code")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Create pg_trgm GIN indexes on address text columns (PostgreSQL only)"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in TRIGRAM_INDEXED_COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_address_address_{column}_trgm "
+                f"ON address_address USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Drop the address trigram indexes"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for column in TRIGRAM_INDEXED_COLUMNS:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_address_address_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('address', '0004_address_ix_address_geo'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,39 @@
+# Generated manually to enforce one address per (owner, city, location, zip code)
+
+from django.db import migrations, models
+from django.db.models.functions import MD5
+
+
+def remove_duplicate_addresses(apps, schema_editor):
+    Address = apps.get_model('address', 'Address')
+    key = ('content_type_id', 'object_id', 'city_id', 'location', 'zip_code')
+    duplicates = (
+        Address.objects.values(*key)
+        .annotate(first_id=models.Min('id'), total=models.Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        Address.objects.filter(**{field: row[field] for field in key}).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0005_address_location_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_addresses, migrations.RunPython.noop),
+        # location is an unbounded TextField, so the btree index behind the constraint stores its hash
+        migrations.AddConstraint(
+            model_name='address',
+            constraint=models.UniqueConstraint(
+                models.F('content_type'),
+                models.F('object_id'),
+                models.F('city'),
+                MD5('location'),
+                models.F('zip_code'),
+                name='uniq_address',
+            ),
+        ),
+    ]
@@ -6,7 +6,7 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .serializers import AddressCreateSerializer, AddressNestedSerializer
-from .services import AddressService
+from .services import address_service
 
 
 class AddressMixin:
@@ -61,8 +61,7 @@ class AddressValidationMixin:
         if not address_data:
             return None
 
-        service = AddressService()
-        validation_result = service.validate_address(address_data)
+        validation_result = address_service.validate_address(address_data)
 
         if not validation_result["is_valid"]:
             raise serializers.ValidationError({"address": validation_result["errors"]})
@@ -77,9 +76,6 @@ class AddressLookupMixin:
 
     def get_address_hierarchy(self, request):
         """Get address hierarchy for cascading dropdowns"""
-        from .services import AddressService
-
-        service = AddressService()
         country_id = request.query_params.get("country_id")
         state_id = request.query_params.get("state_id")
 
@@ -88,17 +84,14 @@ class AddressLookupMixin:
         if state_id:
             state_id = int(state_id)
 
-        return service.get_address_hierarchy(country_id, state_id)
+        return address_service.get_address_hierarchy(country_id, state_id)
 
     def get_location_suggestions(self, request):
         """Get location suggestions for autocomplete"""
-        from .services import AddressService
-
-        service = AddressService()
         query = request.query_params.get("q", "")
         limit = int(request.query_params.get("limit", 10))
 
-        return service.get_location_suggestions(query, limit)
+        return address_service.get_location_suggestions(query, limit)
 
 
 class AddressSerializerMixin(AddressFieldMixin, AddressValidationMixin):
@@ -153,15 +146,12 @@ class AddressCreateSerializerMixin(AddressFieldMixin, AddressValidationMixin):
 
     def create(self, validated_data):
         """Create entity with address"""
-        from .services import AddressService
-
         address_data = validated_data.pop("address_data", None)
         address_id = validated_data.pop("address_id", None)
 
         # Handle address creation or assignment
         if address_data:
-            service = AddressService()
-            address, created = service.get_or_create_address(address_data)
+            address, created = address_service.get_or_create_address(address_data)
             validated_data["address"] = address
         elif address_id:
             validated_data["address_id"] = address_id
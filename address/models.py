@@ -2,10 +2,10 @@
 Models for the address
 """
 
-from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.functions import MD5
 
 
 class Address(models.Model):
@@ -27,9 +27,66 @@ class Address(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized from the city/state/country hierarchy so reads need no joins
+    city_name = models.CharField(max_length=255, blank=True, default="")
+    state_name = models.CharField(max_length=255, blank=True, default="")
+    country_name = models.CharField(max_length=255, blank=True, default="")
+    country_code = models.CharField(max_length=50, blank=True, default="")
+    full_address = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["country", "state", "city"], name="ix_address_geo"),
+        ]
+        constraints = [
+            # location is an unbounded TextField, so the unique index stores its hash rather than the text
+            models.UniqueConstraint(
+                models.F("content_type"),
+                models.F("object_id"),
+                models.F("city"),
+                MD5("location"),
+                models.F("zip_code"),
+                name="uniq_address",
+            ),
+        ]
+
     def __str__(self):
         return self.location
 
+    def save(self, *args, **kwargs):
+        self.refresh_denormalized_fields()
+        super().save(*args, **kwargs)
+
+    def refresh_denormalized_fields(self):
+        """
+        Copy the hierarchy keys and names onto the address and rebuild full_address
+        """
+        if self.city_id:
+            city = self.get_city_with_hierarchy()
+            self.state_id = city.state_id
+            self.country_id = city.state.country_id
+            self.city_name = city.name
+            self.state_name = city.state.name
+            self.country_name = city.state.country.name
+            self.country_code = city.state.country.code
+        self.full_address = self.build_full_address()
+
+    def get_city_with_hierarchy(self) -> "City":
+        """
+        Get the city with its state and country, loading all three in one query unless already cached
+        """
+        city = self.city if Address.city.is_cached(self) else None
+        if city is None or not (City.state.is_cached(city) and State.country.is_cached(city.state)):
+            city = City.objects.select_related("state__country").get(pk=self.city_id)
+            self.city = city
+        return city
+
+    def build_full_address(self):
+        """
+        Format the full address from the denormalized columns
+        """
+        return f"{self.location}, {self.city_name}, {self.state_name}, {self.country_name} {self.zip_code}"
+
 
 class Country(models.Model):
     """
@@ -0,0 +1,161 @@
+"""
+Text helpers for location search
+"""
+
+import re
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Compiled once at import so the search path never recompiles the pattern
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase text and collapse punctuation and whitespace to single spaces
+    """
+    return " ".join(tokenize(text))
+
+
+def pack_trigram(gram: str) -> int:
+    """
+    Pack a 3-character trigram into one int (21 bits per code point)
+    """
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+
+def trigrams(text: str) -> Set[int]:
+    """
+    Get packed pg_trgm-style trigrams: each word is padded with two leading spaces and one trailing space
+    """
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(pack_trigram(padded[i : i + 3]) for i in range(len(padded) - 2))
+    return grams
+
+
+def split_search_limit(limit: int) -> Dict[str, int]:
+    """
+    Split a result limit into per-type quotas that add up to exactly `limit`
+
+    Cities get half, states a quarter and countries the remainder.
+    """
+    city_limit = limit // 2
+    state_limit = limit // 4
+    return {"city": city_limit, "state": state_limit, "country": limit - city_limit - state_limit}
+
+
+class LocationIndex:
+    """
+    In-memory trigram index over countries, states and cities.
+
+    Entries are stored as parallel arrays (type, id, name, parent). Trigrams
+    are packed into ints and each maps to a sorted, contiguous array of the
+    entry positions containing it. A search matches names containing the
+    query, like the icontains lookup it replaces, and the trigrams only narrow
+    the candidates and rank the matches.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int, str, Optional[str]]]):
+        self.types: List[str] = []
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.normalized_names: List[str] = []
+        self.parents: List[Optional[str]] = []
+        self.gram_counts = array("I")
+        postings: Dict[int, List[int]] = defaultdict(list)
+
+        for position, (entry_type, entry_id, name, parent) in enumerate(entries):
+            grams = trigrams(name)
+            self.types.append(entry_type)
+            self.ids.append(entry_id)
+            self.names.append(name)
+            self.normalized_names.append(normalize(name))
+            self.parents.append(parent)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(position)
+
+        # Positions are appended in order, so each posting list is already sorted
+        self.postings: Dict[int, array] = {gram: array("I", positions) for gram, positions in postings.items()}
+
+    @classmethod
+    def build(cls) -> "LocationIndex":
+        """Load every country, state and city in three queries"""
+        from .models import City, Country, State
+
+        entries = []
+        for city in City.objects.values_list("id", "name", "state__name", "state__country__name"):
+            entries.append(("city", city[0], city[1], f"{city[2]}, {city[3]}"))
+        for state in State.objects.values_list("id", "name", "country__name"):
+            entries.append(("state", state[0], state[1], state[2]))
+        for country in Country.objects.values_list("id", "name"):
+            entries.append(("country", country[0], country[1], None))
+        return cls(entries)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Find entries whose name contains the query, ranked by trigram (Jaccard) similarity
+        """
+        query_normalized = normalize(query)
+        if not query_normalized:
+            return []
+        query_grams = trigrams(query)
+
+        # Counter counts an iterable in C, so the per-posting loop never runs as Python bytecode
+        shared = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in query_grams))
+
+        quotas = split_search_limit(limit)
+        ranked = {entry_type: [] for entry_type in quotas}
+        for position in self._candidates(query_normalized):
+            if query_normalized not in self.normalized_names[position]:
+                continue
+            count = shared[position]
+            similarity = count / (len(query_grams) + self.gram_counts[position] - count)
+            ranked[self.types[position]].append((-similarity, self.names[position], position))
+
+        results = []
+        for entry_type, quota in quotas.items():
+            for _, _, position in sorted(ranked[entry_type])[:quota]:
+                results.append(self._result(position))
+        return results
+
+    def _candidates(self, query_normalized: str) -> Iterable[int]:
+        """
+        Get the positions whose names can contain the query
+
+        A name containing the query contains every unpadded trigram of its
+        words, so intersecting those postings leaves far fewer names to check.
+        Words shorter than a trigram have none, and fall back to every entry.
+        """
+        grams = {pack_trigram(token[i : i + 3]) for token in query_normalized.split() for i in range(len(token) - 2)}
+        if not grams:
+            return range(len(self.names))
+
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for positions in postings[1:]:
+            candidates.intersection_update(positions)
+        return candidates
+
+    def _result(self, position: int) -> Dict:
+        """Format an entry as a search result"""
+        name = self.names[position]
+        parent = self.parents[position]
+        return {
+            "type": self.types[position],
+            "id": self.ids[position],
+            "name": name,
+            "parent": parent,
+            "full_name": f"{name}, {parent}" if parent else name,
+        }
@@ -2,10 +2,13 @@
 Address serializers
 """
 
+from functools import lru_cache
+
 from django.contrib.contenttypes.models import ContentType
-from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from core.serializers import CachedFieldsModelSerializer
+
 from .models import Address, City, Country, State
 
 
@@ -62,16 +65,12 @@ class CitySerializer(serializers.ModelSerializer):
 
 
 # Nested serializers for related entities
-class AddressNestedSerializer(serializers.ModelSerializer):
+class AddressNestedSerializer(CachedFieldsModelSerializer):
     """
     Nested address serializer for use in other entities
+    Reads the denormalized hierarchy columns, so no joins are needed
     """
 
-    city_name = serializers.CharField(source="city.name", read_only=True)
-    state_name = serializers.CharField(source="city.state.name", read_only=True)
-    country_name = serializers.CharField(source="city.state.country.name", read_only=True)
-    country_code = serializers.CharField(source="city.state.country.code", read_only=True)
-
     class Meta:
         model = Address
         fields = (
@@ -85,6 +84,11 @@ class AddressNestedSerializer(serializers.ModelSerializer):
         )
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        # Every field is a plain int/str column, so read attributes directly
+        # instead of running each field's get_attribute/to_representation
+        return {name: getattr(instance, name) for name in self.Meta.fields}
+
 
 class AddressCreateSerializer(serializers.ModelSerializer):
     """
@@ -92,10 +96,6 @@ class AddressCreateSerializer(serializers.ModelSerializer):
     """
 
     city_id = serializers.IntegerField(write_only=True)
-    city_name = serializers.CharField(source="city.name", read_only=True)
-    state_name = serializers.CharField(source="city.state.name", read_only=True)
-    country_name = serializers.CharField(source="city.state.country.name", read_only=True)
-    country_code = serializers.CharField(source="city.state.country.code", read_only=True)
 
     class Meta:
         model = Address
@@ -117,39 +117,70 @@ class AddressCreateSerializer(serializers.ModelSerializer):
             "country_code",
         )
 
-    def validate_city_id(self, value):
-        """Validate that city exists"""
-        if not City.objects.filter(id=value).exists():
-            raise serializers.ValidationError("City does not exist")
-        return value
-
     def validate(self, attrs):
         """Validate the complete address"""
         city_id = attrs.get("city_id")
         if city_id:
-            city = City.objects.select_related("state__country").get(id=city_id)
-            attrs["city"] = city
+            try:
+                # Address.save() copies the hierarchy names from this city, so load them in the same query
+                attrs["city"] = City.objects.select_related("state__country").get(id=city_id)
+            except City.DoesNotExist:
+                raise serializers.ValidationError({"city_id": "City does not exist"})
         return attrs
 
 
+# Models that can own an address
+ALLOWED_ADDRESS_CT_SLUGS = frozenset({"user", "company"})
+
+
+@lru_cache(maxsize=len(ALLOWED_ADDRESS_CT_SLUGS))
+def _content_type_for_model(model):
+    """Resolve an allowed content type by model name once per process"""
+    return ContentType.objects.get(model=model)
+
+
+class CachedContentTypeField(serializers.SlugRelatedField):
+    """
+    Content type slug field limited to address owners, resolving rows from
+    process-wide caches instead of querying django_content_type on every request
+    """
+
+    queryset = ContentType.objects.filter(model__in=ALLOWED_ADDRESS_CT_SLUGS)
+
+    def to_internal_value(self, data):
+        slug = str(data)
+        if slug not in ALLOWED_ADDRESS_CT_SLUGS:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=slug)
+        try:
+            return _content_type_for_model(slug)
+        except ContentType.DoesNotExist:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=slug)
+        except ContentType.MultipleObjectsReturned:
+            self.fail("invalid")
+
+    def get_attribute(self, instance):
+        return ContentType.objects.get_for_id(instance.content_type_id)
+
+
 class AddressSerializer(serializers.ModelSerializer):
     """
-    Full address serializer with nested relationships
+    Full address serializer with a flat city/state/country representation
+    The state and country are derived from the city on save, so clients only send city_id
     """
 
-    city = CitySerializer(read_only=True)
-    content_type = serializers.SlugRelatedField(slug_field="model", queryset=ContentType.objects.all())
-    country_id = serializers.IntegerField(write_only=True, required=True)
-    state_id = serializers.IntegerField(write_only=True, required=True)
+    city_id = serializers.IntegerField()
+    content_type = CachedContentTypeField(slug_field="model")
 
     class Meta:
         model = Address
         fields = (
             "id",
             "location",
-            "city",
-            "country_id",
-            "state_id",
+            "city_id",
+            "city_name",
+            "state_name",
+            "country_name",
+            "country_code",
             "content_type",
             "object_id",
             "zip_code",
@@ -157,29 +188,29 @@ class AddressSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("created_at", "updated_at", "status")
-
-    def validate_city_id(self, value):
-        """Validate that city exists"""
-        if not City.objects.filter(id=value).exists():
-            raise serializers.ValidationError("City does not exist")
-        return value
+        read_only_fields = (
+            "city_name",
+            "state_name",
+            "country_name",
+            "country_code",
+            "created_at",
+            "updated_at",
+            "status",
+        )
 
-    #
     def validate(self, attrs):
         """Validate the complete address"""
         city_id = attrs.get("city_id")
-
-        content_type = attrs.get("content_type")
-        object_id = attrs.get("object_id")
         if city_id:
-            city = City.objects.select_related("state__country").get(id=city_id)
-            attrs["city"] = city
+            try:
+                attrs["city"] = City.objects.select_related("state__country").get(id=city_id)
+            except City.DoesNotExist:
+                raise serializers.ValidationError({"city_id": "City does not exist"})
         return attrs
 
 
 # Lookup serializers for dropdowns and autocomplete
-class CountryLookupSerializer(serializers.ModelSerializer):
+class CountryLookupSerializer(CachedFieldsModelSerializer):
     """
     Simplified country serializer for lookups
     """
@@ -187,9 +218,10 @@ class CountryLookupSerializer(serializers.ModelSerializer):
     class Meta:
         model = Country
         fields = ("id", "name", "code")
+        read_only_fields = fields
 
 
-class StateLookupSerializer(serializers.ModelSerializer):
+class StateLookupSerializer(CachedFieldsModelSerializer):
     """
     Simplified state serializer for lookups
     """
@@ -199,9 +231,10 @@ class StateLookupSerializer(serializers.ModelSerializer):
     class Meta:
         model = State
         fields = ("id", "name", "country_name")
+        read_only_fields = fields
 
 
-class CityLookupSerializer(serializers.ModelSerializer):
+class CityLookupSerializer(CachedFieldsModelSerializer):
     """
     Simplified city serializer for lookups
     """
@@ -212,6 +245,7 @@ class CityLookupSerializer(serializers.ModelSerializer):
     class Meta:
         model = City
         fields = ("id", "name", "state_name", "country_name")
+        read_only_fields = fields
 
 
 # Address validation serializer
@@ -224,21 +258,12 @@ class AddressValidationSerializer(serializers.Serializer):
     city_id = serializers.IntegerField()
     zip_code = serializers.CharField(max_length=20)
 
-    def validate_city_id(self, value):
-        """Validate that city exists"""
-        if not City.objects.filter(id=value).exists():
-            raise serializers.ValidationError("City does not exist")
-        return value
-
     def validate(self, attrs):
         """Validate the complete address"""
         city_id = attrs.get("city_id")
-        if city_id:
-            try:
-                city = City.objects.select_related("state__country").get(id=city_id)
-                attrs["city"] = city
-            except City.DoesNotExist:
-                raise serializers.ValidationError("Invalid city")
+        # Only existence matters here; validate_address resolves the names from its cache
+        if city_id and not City.objects.filter(id=city_id).exists():
+            raise serializers.ValidationError({"city_id": "City does not exist"})
         return attrs
 
 
@@ -253,17 +278,30 @@ class AddressSearchSerializer(serializers.Serializer):
     state_id = serializers.IntegerField(required=False)
     city_id = serializers.IntegerField(required=False)
 
-    def validate_country_id(self, value):
-        if not Country.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Country does not exist")
-        return value
+    def validate(self, attrs):
+        """
+        Validate the provided location IDs with one query on the most specific one,
+        which also checks that they belong to the same hierarchy
+        """
+        country_id = attrs.get("country_id")
+        state_id = attrs.get("state_id")
+        city_id = attrs.get("city_id")
 
-    def validate_state_id(self, value):
-        if not State.objects.filter(id=value).exists():
-            raise serializers.ValidationError("State does not exist")
-        return value
+        if city_id is not None:
+            row = City.objects.filter(id=city_id).values_list("state_id", "state__country_id").first()
+            if row is None:
+                raise serializers.ValidationError({"city_id": "City does not exist"})
+            if state_id is not None and state_id != row[0]:
+                raise serializers.ValidationError({"state_id": "State does not match the city"})
+            if country_id is not None and country_id != row[1]:
+                raise serializers.ValidationError({"country_id": "Country does not match the city"})
+        elif state_id is not None:
+            row = State.objects.filter(id=state_id).values_list("country_id", flat=True).first()
+            if row is None:
+                raise serializers.ValidationError({"state_id": "State does not exist"})
+            if country_id is not None and country_id != row:
+                raise serializers.ValidationError({"country_id": "Country does not match the state"})
+        elif country_id is not None and not Country.objects.filter(id=country_id).exists():
+            raise serializers.ValidationError({"country_id": "Country does not exist"})
 
-    def validate_city_id(self, value):
-        if not City.objects.filter(id=value).exists():
-            raise serializers.ValidationError("City does not exist")
-        return value
+        return attrs
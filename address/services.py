@@ -2,12 +2,181 @@
 Address services for lookup, validation, and management
 """
 
+import hashlib
+import logging
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.cache import cache
-from django.db.models import Q
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower
 
+from .batchers import state_batcher
 from .models import Address, City, Country, State
+from .search import LocationIndex, split_search_limit, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Reference data (countries/states/cities) changes rarely, so lookups are cached for a day
+LOOKUP_CACHE_TIMEOUT = 60 * 60 * 24
+LOOKUP_CACHE_VERSION_KEY = "addr:ver"
+
+# Location search results are cached briefly to absorb repeated autocomplete prefixes
+SEARCH_CACHE_TIMEOUT = 30
+
+# Per-process L1 in front of the shared cache; other workers pick up edits within this TTL
+LOCAL_LOOKUP_CACHE_TIMEOUT = 60
+_local_lookup_cache = TTLCache(maxsize=1024, ttl=LOCAL_LOOKUP_CACHE_TIMEOUT)
+_local_lookup_lock = threading.Lock()
+
+# Statistics are recomputed in the background once stale; the hard TTL only bounds memory
+STATISTICS_CACHE_KEY = "addr:stats"
+STATISTICS_CACHE_TIMEOUT = 60 * 60
+STATISTICS_REFRESH_LOCK_KEY = "addr:stats:refreshing"
+
+
+def lookup_cache_key(*parts) -> str:
+    """
+    Build a versioned cache key for address lookups
+    """
+    version = cache.get_or_set(LOOKUP_CACHE_VERSION_KEY, 1, None)
+    return ":".join(["addr", f"v{version}", *map(str, parts)])
+
+
+async def alookup_cache_key(*parts) -> str:
+    """
+    Async counterpart of lookup_cache_key
+    """
+    version = await cache.aget_or_set(LOOKUP_CACHE_VERSION_KEY, 1, None)
+    return ":".join(["addr", f"v{version}", *map(str, parts)])
+
+
+def get_local_lookup(*parts):
+    """
+    Get a lookup from this process's cache, or None
+    """
+    with _local_lookup_lock:
+        return _local_lookup_cache.get(parts)
+
+
+def set_local_lookup(value, *parts) -> None:
+    """
+    Store a lookup in this process's cache
+    """
+    with _local_lookup_lock:
+        _local_lookup_cache[parts] = value
+
+
+def cached_lookup(fetch, *parts):
+    """
+    Get a lookup from the process cache, then the shared cache, then `fetch`
+    """
+    value = get_local_lookup(*parts)
+    if value is None:
+        value = cache.get_or_set(lookup_cache_key(*parts), fetch, LOOKUP_CACHE_TIMEOUT)
+        set_local_lookup(value, *parts)
+    return value
+
+
+def invalidate_lookup_cache() -> None:
+    """
+    Invalidate all cached address lookups by bumping the key version
+    """
+    with _local_lookup_lock:
+        _local_lookup_cache.clear()
+
+    try:
+        cache.incr(LOOKUP_CACHE_VERSION_KEY)
+    except ValueError:
+        # Version key expired or evicted; start a fresh namespace
+        cache.set(LOOKUP_CACHE_VERSION_KEY, int(time.time()), None)
+
+
+_location_index: Optional[LocationIndex] = None
+_location_index_version = None
+_location_index_lock = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """
+    Get this worker's in-memory location index, rebuilding it when the lookup cache version changes
+
+    Only one thread rebuilds at a time. While it does, other callers keep searching the
+    stale index instead of waiting; they only block when there is no index yet.
+    """
+    global _location_index, _location_index_version
+
+    version = cache.get_or_set(LOOKUP_CACHE_VERSION_KEY, 1, None)
+    if _location_index is not None and _location_index_version == version:
+        return _location_index
+
+    if not _location_index_lock.acquire(blocking=_location_index is None):
+        return _location_index
+    try:
+        # Another thread may have finished the rebuild while this one waited for the lock
+        if _location_index is None or _location_index_version != version:
+            _location_index = LocationIndex.build()
+            _location_index_version = version
+    finally:
+        _location_index_lock.release()
+    return _location_index
+
+
+def hierarchy_counts() -> Dict[str, int]:
+    """
+    Count countries, states and cities exactly, in one combined query
+    """
+    tables = {
+        "total_countries": Country._meta.db_table,
+        "total_states": State._meta.db_table,
+        "total_cities": City._meta.db_table,
+    }
+    quote_name = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {quote_name(table)})" for table in tables.values()))
+        return dict(zip(tables, cursor.fetchone()))
+
+
+def filter_by_name(queryset, query: str):
+    """
+    Filter a Country/State/City queryset by name.
+
+    On PostgreSQL this uses the pg_trgm `%` operator (backed by the GIN trigram
+    index) ordered by similarity; queries shorter than a trigram fall back to a
+    prefix match on lower(name). Other backends use a plain icontains scan.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.filter(name__icontains=query)
+
+    if len(query) < 3:
+        return filter_by_name_prefix(queryset, query)
+
+    return (
+        queryset.filter(TrigramSimilar(F("name"), query))
+        .annotate(similarity=TrigramSimilarity("name", query))
+        .order_by("-similarity")
+    )
+
+
+def filter_by_name_prefix(queryset, query: str):
+    """
+    Filter a Country/State/City queryset to names starting with `query`, ignoring case.
+
+    On PostgreSQL this compares lower(name), so the lower(name)
+    varchar_pattern_ops index serves it as a range scan; istartswith would
+    compile to UPPER(name) LIKE and miss that index.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.filter(name__istartswith=query).order_by("name")
+
+    return queryset.annotate(name_lower=Lower("name")).filter(name_lower__startswith=query.lower()).order_by("name")
 
 
 class AddressService:
@@ -31,18 +200,23 @@ class AddressService:
         city_id = address_data.get("city_id")
         location = address_data.get("location")
         zip_code = address_data.get("zip_code")
+        content_type_id = address_data.get("content_type_id")
+        object_id = address_data.get("object_id")
 
         if not all([city_id, location, zip_code]):
             raise ValueError("Missing required address fields")
-
-        # Try to find existing address
-        try:
-            address = Address.objects.get(city_id=city_id, location=location, zip_code=zip_code)
-            return address, False
-        except Address.DoesNotExist:
-            # Create new address
-            address = Address.objects.create(city_id=city_id, location=location, zip_code=zip_code)
-            return address, True
+        if not all([content_type_id, object_id]):
+            raise ValueError("Missing address owner fields: content_type_id and object_id are required")
+
+        # The lookup covers every uniq_address column, so a concurrent insert of the same
+        # address surfaces as an IntegrityError that get_or_create answers by re-reading the row
+        return Address.objects.get_or_create(
+            city_id=city_id,
+            location=location,
+            zip_code=zip_code,
+            content_type_id=content_type_id,
+            object_id=object_id,
+        )
 
     def validate_address(self, address_data: Dict) -> Dict:
         """
@@ -67,21 +241,41 @@ class AddressService:
             return result
 
         # Validate city exists
-        try:
-            city = City.objects.select_related("state__country").get(id=address_data["city_id"])
+        city = self._city_with_hierarchy(address_data["city_id"])
+        if city:
             result["normalized_address"] = {
                 "location": address_data["location"].strip(),
-                "city": city.name,
-                "state": city.state.name,
-                "country": city.state.country.name,
+                "city": city["name"],
+                "state": city["state_name"],
+                "country": city["country_name"],
                 "zip_code": address_data["zip_code"].strip(),
             }
-        except City.DoesNotExist:
+        else:
             result["errors"].append("Invalid city ID")
             result["is_valid"] = False
 
         return result
 
+    def _city_with_hierarchy(self, city_id: int) -> Optional[Dict]:
+        """
+        Get a city's name with its state and country names, or None if it does not exist
+
+        Cached like the other lookups, so the version bump on City/State/Country
+        changes invalidates it.
+        """
+        return cached_lookup(
+            lambda: City.objects.filter(id=city_id)
+            .values(
+                "name",
+                state_name=F("state__name"),
+                country_name=F("state__country__name"),
+                country_code=F("state__country__code"),
+            )
+            .first(),
+            "city",
+            city_id,
+        )
+
     def search_addresses(self, query: str, filters: Dict = None) -> List[Address]:
         """
         Search addresses based on query and filters
@@ -97,24 +291,27 @@ class AddressService:
 
         # Apply text search
         if query:
+            # Denormalized name columns keep the filter on the address table itself
             queryset = queryset.filter(
                 Q(location__icontains=query)
-                | Q(city__name__icontains=query)
-                | Q(city__state__name__icontains=query)
-                | Q(city__state__country__name__icontains=query)
+                | Q(city_name__icontains=query)
+                | Q(state_name__icontains=query)
+                | Q(country_name__icontains=query)
                 | Q(zip_code__icontains=query)
             )
 
         # Apply filters
         if filters:
             if filters.get("country_id"):
-                queryset = queryset.filter(city__state__country_id=filters["country_id"])
+                queryset = queryset.filter(country_id=filters["country_id"])
             if filters.get("state_id"):
-                queryset = queryset.filter(city__state_id=filters["state_id"])
+                queryset = queryset.filter(state_id=filters["state_id"])
             if filters.get("city_id"):
                 queryset = queryset.filter(city_id=filters["city_id"])
 
-        return queryset.distinct()
+        # Every predicate is on the address row and select_related only follows
+        # foreign keys, so rows cannot repeat and no DISTINCT is needed
+        return queryset
 
     def get_address_hierarchy(self, country_id: int = None, state_id: int = None) -> Dict:
         """
@@ -127,37 +324,37 @@ class AddressService:
         Returns:
             Dictionary with countries, states, and cities
         """
-        cache_key = f"address_hierarchy_{country_id}_{state_id}"
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            return cached_result
-
-        result = {"countries": [], "states": [], "cities": []}
+        return cached_lookup(lambda: self._build_address_hierarchy(country_id, state_id), "hierarchy", country_id, state_id)
+
+    def _build_address_hierarchy(self, country_id: int = None, state_id: int = None) -> Dict:
+        """Query the address hierarchy without caching"""
+        return {
+            "countries": self._fetch_countries(),
+            "states": self._fetch_states(country_id),
+            "cities": self._fetch_cities(country_id, state_id),
+        }
 
-        # Get countries
-        countries = Country.objects.all().order_by("name")
-        result["countries"] = [{"id": c.id, "name": c.name, "code": c.code} for c in countries]
+    def _fetch_countries(self) -> List[Dict]:
+        """Get all countries for the hierarchy"""
+        return list(Country.objects.values("id", "name", "code").order_by("name"))
 
-        # Get states (filtered by country if provided)
-        states_query = State.objects.select_related("country")
+    def _fetch_states(self, country_id: int = None) -> List[Dict]:
+        """Get states for the hierarchy (filtered by country if provided)"""
+        states_query = State.objects.all()
         if country_id:
             states_query = states_query.filter(country_id=country_id)
 
-        states = states_query.order_by("name")
-        result["states"] = [{"id": s.id, "name": s.name, "country_id": s.country_id} for s in states]
+        return list(states_query.values("id", "name", "country_id").order_by("name"))
 
-        # Get cities (filtered by state if provided)
-        cities_query = City.objects.select_related("state__country")
+    def _fetch_cities(self, country_id: int = None, state_id: int = None) -> List[Dict]:
+        """Get cities for the hierarchy (filtered by state, then country, if provided)"""
+        cities_query = City.objects.all()
         if state_id:
             cities_query = cities_query.filter(state_id=state_id)
         elif country_id:
             cities_query = cities_query.filter(state__country_id=country_id)
 
-        cities = cities_query.order_by("name")
-        result["cities"] = [{"id": c.id, "name": c.name, "state_id": c.state_id} for c in cities]
-
-        cache.set(cache_key, result, self.cache_timeout)
-        return result
+        return list(cities_query.values("id", "name", "state_id").order_by("name"))
 
     def get_location_suggestions(self, query: str, limit: int = 10) -> List[Dict]:
         """
@@ -178,45 +375,43 @@ class AddressService:
         if cached_result:
             return cached_result
 
-        suggestions = []
-
-        # Search cities
-        cities = City.objects.select_related("state__country").filter(name__icontains=query)[: limit // 2]
-
-        for city in cities:
-            suggestions.append(
-                {
-                    "type": "city",
-                    "id": city.id,
-                    "name": city.name,
-                    "state": city.state.name,
-                    "country": city.state.country.name,
-                    "display": f"{city.name}, {city.state.name}, {city.state.country.name}",
-                }
-            )
-
-        # Search states
-        states = State.objects.select_related("country").filter(name__icontains=query)[: limit // 4]
-
-        for state in states:
-            suggestions.append(
-                {
-                    "type": "state",
-                    "id": state.id,
-                    "name": state.name,
-                    "country": state.country.name,
-                    "display": f"{state.name}, {state.country.name}",
-                }
-            )
-
-        # Search countries
-        countries = Country.objects.filter(name__icontains=query)[: limit // 4]
-
-        for country in countries:
-            suggestions.append({"type": "country", "id": country.id, "name": country.name, "display": country.name})
+        # Autocomplete completes what the user is typing, so single words match on
+        # prefix; queries with spaces keep the trigram substring search
+        name_filter = filter_by_name if " " in query.strip() else filter_by_name_prefix
+
+        quotas = split_search_limit(limit)
+        cities = name_filter(City.objects.all(), query).values("id", "name", "state__name", "state__country__name")
+        states = name_filter(State.objects.all(), query).values("id", "name", "country__name")
+        countries = name_filter(Country.objects.all(), query).values("id", "name")
+
+        suggestions = [
+            {
+                "type": "city",
+                "id": city["id"],
+                "name": city["name"],
+                "state": city["state__name"],
+                "country": city["state__country__name"],
+                "display": f"{city['name']}, {city['state__name']}, {city['state__country__name']}",
+            }
+            for city in cities[: quotas["city"]].iterator(chunk_size=100)
+        ]
+        suggestions += [
+            {
+                "type": "state",
+                "id": state["id"],
+                "name": state["name"],
+                "country": state["country__name"],
+                "display": f"{state['name']}, {state['country__name']}",
+            }
+            for state in states[: quotas["state"]].iterator(chunk_size=100)
+        ]
+        suggestions += [
+            {"type": "country", "id": country["id"], "name": country["name"], "display": country["name"]}
+            for country in countries[: quotas["country"]].iterator(chunk_size=100)
+        ]
 
         cache.set(cache_key, suggestions, self.cache_timeout)
-        return suggestions[:limit]
+        return suggestions
 
     def normalize_address(self, address_data: Dict) -> Dict:
         """
@@ -236,18 +431,16 @@ class AddressService:
 
         # Get city information for additional normalization
         if normalized["city_id"]:
-            try:
-                city = City.objects.select_related("state__country").get(id=normalized["city_id"])
+            city = self._city_with_hierarchy(normalized["city_id"])
+            if city:
                 normalized.update(
                     {
-                        "city_name": city.name,
-                        "state_name": city.state.name,
-                        "country_name": city.state.country.name,
-                        "country_code": city.state.country.code,
+                        "city_name": city["name"],
+                        "state_name": city["state_name"],
+                        "country_name": city["country_name"],
+                        "country_code": city["country_code"],
                     }
                 )
-            except City.DoesNotExist:
-                pass
 
         return normalized
 
@@ -255,27 +448,77 @@ class AddressService:
         """
         Get address-related statistics
 
+        Served stale-while-revalidate: once the cached value is older than
+        `cache_timeout`, the stale value is returned while a background task
+        recomputes it.
+
         Returns:
             Dictionary with address statistics
         """
-        cache_key = "address_statistics"
-        cached_result = cache.get(cache_key)
+        cached_result = cache.get(STATISTICS_CACHE_KEY)
         if cached_result:
-            return cached_result
+            return self._serve_statistics(cached_result)
 
-        stats = {
-            "total_addresses": Address.objects.filter(status=True).count(),
-            "total_cities": City.objects.count(),
-            "total_states": State.objects.count(),
-            "total_countries": Country.objects.count(),
-            "countries_with_addresses": Address.objects.filter(status=True)
-            .values_list("city__state__country__name", flat=True)
-            .distinct()
-            .count(),
-        }
+        return self.refresh_address_statistics()
+
+    def _serve_statistics(self, cached_result: Dict) -> Dict:
+        """Return cached statistics, queueing a refresh once they are stale"""
+        if cached_result["refresh_at"] <= time.time() and cache.add(STATISTICS_REFRESH_LOCK_KEY, True, 60):
+            self._schedule_statistics_refresh()
+        return cached_result["stats"]
+
+    def refresh_address_statistics(self) -> Dict:
+        """
+        Recompute address statistics and store them in the cache
+        """
+        entry = self._build_statistics_entry()
+        cache.set(STATISTICS_CACHE_KEY, entry, STATISTICS_CACHE_TIMEOUT)
+        cache.delete(STATISTICS_REFRESH_LOCK_KEY)
+        return entry["stats"]
+
+    def _build_statistics_entry(self) -> Dict:
+        """Query address statistics and wrap them with their refresh deadline"""
+        stats = Address.objects.filter(status=True).aggregate(
+            total_addresses=Count("id"),
+            countries_with_addresses=Count("country", distinct=True),
+        )
+        stats.update(hierarchy_counts())
+        return {"stats": stats, "refresh_at": time.time() + self.cache_timeout}
+
+    def _schedule_statistics_refresh(self) -> None:
+        """Queue a background recompute of the statistics"""
+        try:
+            from .tasks import refresh_address_statistics
+
+            refresh_address_statistics.delay()
+        except Exception as e:
+            logger.error(f"Failed to queue address statistics refresh: {str(e)}")
+            cache.delete(STATISTICS_REFRESH_LOCK_KEY)
 
-        cache.set(cache_key, stats, self.cache_timeout)
-        return stats
+    async def avalidate_address(self, address_data: Dict) -> Dict:
+        """Async counterpart of validate_address"""
+        return await sync_to_async(self.validate_address)(address_data)
+
+    async def aget_address_hierarchy(self, country_id: int = None, state_id: int = None) -> Dict:
+        """
+        Async counterpart of get_address_hierarchy
+
+        The three queries run in a single sync_to_async call on the shared sync
+        thread, so they use that thread's request-scoped database connection.
+        Database errors propagate to the caller.
+        """
+        result = get_local_lookup("hierarchy", country_id, state_id)
+        if result is not None:
+            return result
+        return await sync_to_async(self.get_address_hierarchy)(country_id, state_id)
+
+    async def aget_address_statistics(self) -> Dict:
+        """Async counterpart of get_address_statistics"""
+        return await sync_to_async(self.get_address_statistics)()
+
+
+# AddressService holds no per-request state, so one instance is shared by all callers
+address_service = AddressService()
 
 
 class AddressLookupService:
@@ -286,70 +529,93 @@ class AddressLookupService:
     @staticmethod
     def get_countries() -> List[Dict]:
         """Get all countries"""
-        return list(Country.objects.values("id", "name", "code").order_by("name"))
+        return cached_lookup(lambda: list(Country.objects.values("id", "name", "code").order_by("name")), "countries")
 
     @staticmethod
     def get_states_by_country(country_id: int) -> List[Dict]:
         """Get states by country ID"""
-        return list(State.objects.filter(country_id=country_id).values("id", "name", "country_id").order_by("name"))
+        return cached_lookup(
+            lambda: list(State.objects.filter(country_id=country_id).values("id", "name", "country_id").order_by("name")),
+            "states",
+            country_id,
+        )
 
     @staticmethod
     def get_cities_by_state(state_id: int) -> List[Dict]:
         """Get cities by state ID"""
-        return list(City.objects.filter(state_id=state_id).values("id", "name", "state_id").order_by("name"))
+        return cached_lookup(
+            lambda: list(City.objects.filter(state_id=state_id).values("id", "name", "state_id").order_by("name")),
+            "cities",
+            state_id,
+        )
 
     @staticmethod
     def get_cities_by_country(country_id: int) -> List[Dict]:
         """Get cities by country ID"""
         return list(
-            City.objects.filter(state__country_id=country_id)
-            .select_related("state")
-            .values("id", "name", "state_id", "state__name")
-            .order_by("name")
+            City.objects.filter(state__country_id=country_id).values("id", "name", "state_id", "state__name").order_by("name")
         )
 
     @staticmethod
     def search_locations(query: str, limit: int = 20) -> List[Dict]:
-        """Search across all location types"""
-        if len(query) < 2:
+        """
+        Search across all location types
+
+        Autocomplete sends the same short prefixes over and over, so results
+        (including empty ones) are cached briefly per (query, limit).
+        """
+        if len(query) < 2 or not tokenize(query):
             return []
 
-        results = []
+        query_hash = hashlib.md5(query.lower().encode()).hexdigest()
+        return cache.get_or_set(
+            lookup_cache_key("search", query_hash, limit),
+            lambda: AddressLookupService._search_locations(query, limit),
+            SEARCH_CACHE_TIMEOUT,
+        )
 
-        # Search cities
-        cities = City.objects.select_related("state__country").filter(name__icontains=query)[: limit // 2]
+    @staticmethod
+    def _search_locations(query: str, limit: int) -> List[Dict]:
+        """Run a location search without caching"""
+        return get_location_index().search(query, limit)
 
-        for city in cities:
-            results.append(
-                {
-                    "type": "city",
-                    "id": city.id,
-                    "name": city.name,
-                    "parent": f"{city.state.name}, {city.state.country.name}",
-                    "full_name": f"{city.name}, {city.state.name}, {city.state.country.name}",
-                }
-            )
+    @staticmethod
+    async def aget_countries() -> List[Dict]:
+        """Async counterpart of get_countries"""
+        countries = get_local_lookup("countries")
+        if countries is not None:
+            return countries
+        return await sync_to_async(AddressLookupService.get_countries)()
 
-        # Search states
-        states = State.objects.select_related("country").filter(name__icontains=query)[: limit // 4]
-
-        for state in states:
-            results.append(
-                {
-                    "type": "state",
-                    "id": state.id,
-                    "name": state.name,
-                    "parent": state.country.name,
-                    "full_name": f"{state.name}, {state.country.name}",
-                }
-            )
+    @staticmethod
+    async def aget_states_by_country(country_id: int) -> List[Dict]:
+        """
+        Async counterpart of get_states_by_country
 
-        # Search countries
-        countries = Country.objects.filter(name__icontains=query)[: limit // 4]
+        Cache misses go through the state batcher, so concurrent requests for
+        different countries share one query.
+        """
+        states = get_local_lookup("states", country_id)
+        if states is not None:
+            return states
+
+        cache_key = await alookup_cache_key("states", country_id)
+        states = await cache.aget(cache_key)
+        if states is None:
+            states = await state_batcher.load(country_id)
+            await cache.aset(cache_key, states, LOOKUP_CACHE_TIMEOUT)
+        set_local_lookup(states, "states", country_id)
+        return states
 
-        for country in countries:
-            results.append(
-                {"type": "country", "id": country.id, "name": country.name, "parent": None, "full_name": country.name}
-            )
+    @staticmethod
+    async def aget_cities_by_state(state_id: int) -> List[Dict]:
+        """Async counterpart of get_cities_by_state"""
+        cities = get_local_lookup("cities", state_id)
+        if cities is not None:
+            return cities
+        return await sync_to_async(AddressLookupService.get_cities_by_state)(state_id)
 
-        return results[:limit]
+    @staticmethod
+    async def asearch_locations(query: str, limit: int = 20) -> List[Dict]:
+        """Async counterpart of search_locations"""
+        return await sync_to_async(AddressLookupService.search_locations)(query, limit)
@@ -0,0 +1,84 @@
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Address, City, Country, State
+from .services import invalidate_lookup_cache
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=City)
+def invalidate_address_lookups(sender, **kwargs):
+    """
+    Invalidate cached address lookups when reference data changes
+    """
+    invalidate_lookup_cache()
+
+
+def _sync_addresses(queryset, **values):
+    """
+    Update denormalized hierarchy keys and names on addresses and rebuild full_address
+    """
+    queryset.update(**values)
+    queryset.update(
+        full_address=Concat(
+            F("location"),
+            Value(", "),
+            F("city_name"),
+            Value(", "),
+            F("state_name"),
+            Value(", "),
+            F("country_name"),
+            Value(" "),
+            F("zip_code"),
+            output_field=TextField(),
+        )
+    )
+
+
+@receiver(post_save, sender=Country)
+def sync_country_on_addresses(sender, instance: Country, created: bool, **kwargs):
+    """
+    Propagate country renames to denormalized addresses
+    """
+    if not created:
+        _sync_addresses(
+            Address.objects.filter(city__state__country=instance), country_name=instance.name, country_code=instance.code
+        )
+
+
+@receiver(post_save, sender=State)
+def sync_state_on_addresses(sender, instance: State, created: bool, **kwargs):
+    """
+    Propagate state renames and moves to another country to denormalized addresses
+    """
+    if not created:
+        _sync_addresses(
+            Address.objects.filter(city__state=instance),
+            country_id=instance.country_id,
+            state_name=instance.name,
+            country_name=instance.country.name,
+            country_code=instance.country.code,
+        )
+
+
+@receiver(post_save, sender=City)
+def sync_city_on_addresses(sender, instance: City, created: bool, **kwargs):
+    """
+    Propagate city renames and moves to another state to denormalized addresses
+    """
+    if not created:
+        _sync_addresses(
+            Address.objects.filter(city=instance),
+            state_id=instance.state_id,
+            country_id=instance.state.country_id,
+            city_name=instance.name,
+            state_name=instance.state.name,
+            country_name=instance.state.country.name,
+            country_code=instance.state.country.code,
+        )
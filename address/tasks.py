@@ -0,0 +1,24 @@
+"""
+Celery tasks for address operations
+"""
+
+import logging
+
+from celery import shared_task
+
+from .services import address_service
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_address_statistics():
+    """
+    Recompute cached address statistics in the background
+    """
+    try:
+        stats = address_service.refresh_address_statistics()
+        return f"Refreshed address statistics for {stats['total_addresses']} addresses"
+    except Exception as e:
+        logger.error(f"Failed to refresh address statistics: {str(e)}")
+        raise
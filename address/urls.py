@@ -14,7 +14,7 @@ from .lookup_views import (
     search_locations,
     validate_address,
 )
-from .views import AddressViewSet, CityViewSet, CountryViewSet, StateViewSet
+from .views import AddressViewSet
 
 router = DefaultRouter()
 router.register(r"", AddressViewSet, basename="address")
@@ -1,31 +1,11 @@
-from django.shortcuts import render
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
-from rest_framework import status, viewsets
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import viewsets
 
 from core.pagination import DefaultPagination
-from core.permissions_enhanced import IsAddressOwnerOrStaff, IsAdminOnly
 from core.viewset_permissions import get_address_permissions, get_address_queryset, get_city_state_country_permissions
 
-from .mixins import AddressLookupMixin
 from .models import Address, City, Country, State
-from .serializers import (
-    AddressCreateSerializer,
-    AddressNestedSerializer,
-    AddressSearchSerializer,
-    AddressSerializer,
-    AddressValidationSerializer,
-    CityLookupSerializer,
-    CitySerializer,
-    CountryLookupSerializer,
-    CountrySerializer,
-    StateLookupSerializer,
-    StateSerializer,
-)
-from .services import AddressLookupService, AddressService
+from .serializers import AddressSerializer, CitySerializer, CountrySerializer, StateSerializer
 
 
 class AddressViewSet(viewsets.ModelViewSet):
@@ -33,7 +13,10 @@ class AddressViewSet(viewsets.ModelViewSet):
     Viewset for the address model
     """
 
-    queryset = Address.objects.all()
+    # AddressSerializer renders denormalized columns and resolves content_type through
+    # the ContentType cache, so rows need no joins or prefetches; full_address,
+    # which it never renders, is left out of the SELECT. Ordering by id keeps pages stable.
+    queryset = Address.objects.defer("full_address").order_by("id")
     serializer_class = AddressSerializer
     pagination_class = DefaultPagination
 
@@ -47,6 +30,16 @@ class AddressViewSet(viewsets.ModelViewSet):
         return get_address_queryset(self)
 
 
+# Write endpoints for reference data are admin-only, so they are hidden from the API docs
+hide_writes_from_docs = extend_schema_view(
+    create=extend_schema(exclude=True),
+    update=extend_schema(exclude=True),
+    partial_update=extend_schema(exclude=True),
+    destroy=extend_schema(exclude=True),
+)
+
+
+@hide_writes_from_docs
 class CityViewSet(viewsets.ModelViewSet):
     """
     Viewset for the city model
@@ -64,36 +57,8 @@ class CityViewSet(viewsets.ModelViewSet):
         """
         return super().get_queryset()
 
-    @extend_schema(exclude=False)
-    def destroy(self, request, *args, **kwargs):
-        """
-        Hide the DELETE endpoint from docs
-        """
-        return super().destroy(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def update(self, request, *args, **kwargs):
-        """
-        Hide the PUT endpoint from docs
-        """
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def partial_update(self, request, *args, **kwargs):
-        """
-        Hide the PATCH endpoint from docs
-        """
-        return super().partial_update(request, *args, **kwargs)
-
-    # hide the endpoints from docs
-    @extend_schema(exclude=False)
-    def create(self, request, *args, **kwargs):
-        """
-        Hide the POST endpoint from docs
-        """
-        return super().create(request, *args, **kwargs)
-
 
+@hide_writes_from_docs
 class StateViewSet(viewsets.ModelViewSet):
     """
     Viewset for the state model
@@ -115,35 +80,8 @@ class StateViewSet(viewsets.ModelViewSet):
         """
         return super().get_queryset()
 
-    @extend_schema(exclude=False)
-    def destroy(self, request, *args, **kwargs):
-        """
-        Hide the DELETE endpoint from docs
-        """
-        return super().destroy(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def update(self, request, *args, **kwargs):
-        """
-        Hide the PUT endpoint from docs
-        """
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def partial_update(self, request, *args, **kwargs):
-        """
-        Hide the PATCH endpoint from docs
-        """
-        return super().partial_update(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def create(self, request, *args, **kwargs):
-        """
-        Hide the POST endpoint from docs
-        """
-        return super().create(request, *args, **kwargs)
-
 
+@hide_writes_from_docs
 class CountryViewSet(viewsets.ModelViewSet):
     """
     Viewset for the country model
@@ -164,31 +102,3 @@ class CountryViewSet(viewsets.ModelViewSet):
         Get the queryset for the country list
         """
         return super().get_queryset()
-
-    @extend_schema(exclude=False)
-    def destroy(self, request, *args, **kwargs):
-        """
-        Hide the DELETE endpoint from docs
-        """
-        return super().destroy(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def update(self, request, *args, **kwargs):
-        """
-        Hide the PUT endpoint from docs
-        """
-        return super().update(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def partial_update(self, request, *args, **kwargs):
-        """
-        Hide the PATCH endpoint from docs
-        """
-        return super().partial_update(request, *args, **kwargs)
-
-    @extend_schema(exclude=False)
-    def create(self, request, *args, **kwargs):
-        """
-        Hide the POST endpoint from docs
-        """
-        return super().create(request, *args, **kwargs)
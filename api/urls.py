@@ -3,11 +3,6 @@ URL configuration for api app.
 """
 
 from django.urls import include, path
-from rest_framework_simplejwt.views import (
-    TokenBlacklistView,
-    TokenObtainPairView,
-    TokenRefreshView,
-)
 from two_factor.urls import urlpatterns as two_factor_patterns
 
 from .views import LoginView, LogoutAllView, LogoutView, RefreshView, RegistrationView
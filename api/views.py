@@ -1,17 +1,43 @@
-from django.shortcuts import render
+import logging
+
+from django.db import transaction
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import serializers, status
+from rest_framework import serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.views import TokenBlacklistView, TokenObtainPairView, TokenRefreshView
 
 from core.mixins import StandardAPIViewMixin
 from core.response import APIResponse, create_error_response_serializer, create_success_response_serializer
+from upload.models import Upload
 from upload.serializers import UploadSerializer
 from user.serializers import UserRegistrationSerializer, UserSerializer
 
+# The notification app (and Celery) is swapped out in some environments, e.g. the test settings
+try:
+    from notification.tasks import send_email_verification
+except ImportError:
+    send_email_verification = None
+
+logger = logging.getLogger(__name__)
+
+
+def _queue_email_verification(user_id):
+    """
+    Queue the verification email for a newly registered user
+    """
+    if send_email_verification is None:
+        logger.warning(f"Email verification is unavailable; not queued for user {user_id}")
+        return
+
+    try:
+        send_email_verification.delay(user_id)
+    except Exception as e:
+        # Log the error but don't fail registration
+        logger.error(f"Failed to queue email verification for user {user_id}: {str(e)}")
+
 
 class LoginResponseSerializer(serializers.Serializer):
     """
@@ -74,67 +100,76 @@ class LogoutAllView(StandardAPIViewMixin, APIView):
         """
         Logout all devices for the user
         """
-        tokens = OutstandingToken.objects.filter(user=request.user)
-        for t in tokens:
-            BlacklistedToken.objects.get_or_create(token=t)
+        # One query for the tokens not yet blacklisted and one insert for all of them;
+        # ignore_conflicts covers a concurrent logout blacklisting the same token
+        token_ids = OutstandingToken.objects.filter(user=request.user, blacklistedtoken__isnull=True).values_list(
+            "id", flat=True
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id in token_ids], ignore_conflicts=True, batch_size=500
+        )
         return self.success_response(data=None, message="Logged out from all devices successfully")
 
 
-@extend_schema_view(
-    post=extend_schema(
-        operation_id="auth_login",
-        summary="Login (obtain access & refresh)",
-        tags=["Auth"],
-        responses={
-            200: {
-                "description": "Login successful",
-                "content": {
-                    "application/json": {
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "success": {"type": "boolean"},
-                                "message": {"type": "string"},
-                                "data": {
+# Login wraps the token pair with the user profile and uploads, which simplejwt cannot describe
+LOGIN_RESPONSE_SCHEMA = {
+    "description": "Login successful",
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "message": {"type": "string"},
+                    "data": {
+                        "type": "object",
+                        "properties": {
+                            "access": {"type": "string", "description": "JWT access token"},
+                            "refresh": {"type": "string", "description": "JWT refresh token"},
+                            "user": {
+                                "type": "object",
+                                "description": "User profile data",
+                                "properties": {
+                                    "id": {"type": "integer"},
+                                    "username": {"type": "string"},
+                                    "email": {"type": "string"},
+                                    "first_name": {"type": "string"},
+                                    "last_name": {"type": "string"},
+                                    "role": {"type": "string"},
+                                    "is_email_verified": {"type": "boolean"},
+                                },
+                            },
+                            "uploads": {
+                                "type": "array",
+                                "description": "User uploads (if any)",
+                                "items": {
                                     "type": "object",
                                     "properties": {
-                                        "access": {"type": "string", "description": "JWT access token"},
-                                        "refresh": {"type": "string", "description": "JWT refresh token"},
-                                        "user": {
-                                            "type": "object",
-                                            "description": "User profile data",
-                                            "properties": {
-                                                "id": {"type": "integer"},
-                                                "username": {"type": "string"},
-                                                "email": {"type": "string"},
-                                                "first_name": {"type": "string"},
-                                                "last_name": {"type": "string"},
-                                                "role": {"type": "string"},
-                                                "is_email_verified": {"type": "boolean"},
-                                            },
-                                        },
-                                        "uploads": {
-                                            "type": "array",
-                                            "description": "User uploads (if any)",
-                                            "items": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "id": {"type": "integer"},
-                                                    "name": {"type": "string"},
-                                                    "type": {"type": "string"},
-                                                    "file_url": {"type": "string"},
-                                                    "file_size": {"type": "integer"},
-                                                    "created_at": {"type": "string", "format": "date-time"},
-                                                },
-                                            },
-                                        },
+                                        "id": {"type": "integer"},
+                                        "name": {"type": "string"},
+                                        "type": {"type": "string"},
+                                        "file_url": {"type": "string"},
+                                        "file_size": {"type": "integer"},
+                                        "created_at": {"type": "string", "format": "date-time"},
                                     },
                                 },
                             },
-                        }
-                    }
+                        },
+                    },
                 },
-            },
+            }
+        }
+    },
+}
+
+
+@extend_schema_view(
+    post=extend_schema(
+        operation_id="auth_login",
+        summary="Login (obtain access & refresh)",
+        tags=["Auth"],
+        responses={
+            200: LOGIN_RESPONSE_SCHEMA,
             401: create_error_response_serializer(message="Invalid credentials", status_code=401),
         },
     )
@@ -148,36 +183,28 @@ class LoginView(TokenObtainPairView):
         """
         Override post method to include user data in response
         """
-        # Get the original response from TokenObtainPairView
-        response = super().post(request, *args, **kwargs)
-
-        # Check if login was successful (status 200)
-        if response.status_code == 200:
-            # Get the user from the serializer's validated data
-            # The TokenObtainPairView sets the user in the serializer
-            serializer = self.get_serializer(data=request.data)
+        # Validate once, as TokenObtainPairView.post does, and keep the serializer:
+        # it holds the authenticated user, so the password is only checked once
+        serializer = self.get_serializer(data=request.data)
+        try:
             serializer.is_valid(raise_exception=True)
-            user = serializer.user
-
-            # Serialize user data
-            user_serializer = UserSerializer(user)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+        user = serializer.user
 
-            # Get user uploads
-            from upload.models import Upload
+        # Serialize user data
+        user_serializer = UserSerializer(user, context={"request": request})
 
-            user_uploads = Upload.objects.filter(uploaded_by=user).order_by("-created_at")
-            uploads_serializer = UploadSerializer(user_uploads, many=True, context={"request": request})
+        # Get user uploads
+        # UploadSerializer renders each upload's content_type slug, so join it in
+        user_uploads = Upload.objects.filter(uploaded_by=user).select_related("content_type").order_by("-created_at")
+        uploads_serializer = UploadSerializer(user_uploads, many=True, context={"request": request})
 
-            # Create new response data with user information and uploads
-            response_data = response.data.copy()
-            response_data["user"] = user_serializer.data
-            response_data["uploads"] = uploads_serializer.data
+        # Create response data with tokens, user information and uploads
+        response_data = {**serializer.validated_data, "user": user_serializer.data, "uploads": uploads_serializer.data}
 
-            # Return standardized API response
-            return APIResponse.success(data=response_data, message="Login successful")
-
-        # For error responses, return as is
-        return response
+        # Return standardized API response
+        return APIResponse.success(data=response_data, message="Login successful")
 
 
 @extend_schema_view(post=extend_schema(operation_id="auth_refresh", summary="Refresh access token", tags=["Auth"]))
@@ -216,17 +243,8 @@ class RegistrationView(StandardAPIViewMixin, APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        # Send email verification asynchronously
-        try:
-            from notification.tasks import send_email_verification
-
-            send_email_verification.delay(user.id)
-        except Exception as e:
-            # Log the error but don't fail registration
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to queue email verification for user {user.id}: {str(e)}")
+        # Queue the verification email once the user row is committed, outside the response path
+        transaction.on_commit(lambda: _queue_email_verification(user.id))
 
         # Return user data without password
         response_serializer = UserSerializer(user)
@@ -5,8 +5,10 @@ Management command to test application resume integration
 import os
 
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from address.models import City, State
 from application.models import Application
@@ -57,6 +59,7 @@ class Command(BaseCommand):
         # Test 2: Create application with explicit resume (backward compatible)
         self.stdout.write("\n2. Testing application creation with explicit resume...")
         resume = self.create_test_resume(user)
+        application.delete()
         application2 = Application.objects.create(job=job, user=user, cover_letter="Test cover letter 2", resume=resume)
 
         self.stdout.write(f"   ✓ Application created: {application2.id}")
@@ -95,6 +98,7 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS("\n✓ Enhanced resume functionality test passed!"))
 
+    @transaction.atomic
     def create_test_data(self):
         """Create test user and job"""
         # Create test user
@@ -129,18 +133,19 @@ class Command(BaseCommand):
             },
         )
 
+        # A user can apply to a job only once, so clear applications left by earlier runs
+        Application.objects.filter(job=job, user=user).delete()
+
         return user, job
 
     def create_test_resume(self, user):
         """Create a test resume upload"""
-        from django.contrib.contenttypes.models import ContentType
-
         # Create a simple test file
         test_content = b"Test resume content"
         test_file = SimpleUploadedFile("test_resume.pdf", test_content, content_type="application/pdf")
 
-        # Get a valid content type
-        content_type = ContentType.objects.first()
+        # Resumes belong to the user; get_for_model is served from the ContentType cache
+        content_type = ContentType.objects.get_for_model(user)
 
         # Create upload record
         resume = Upload.objects.create(
@@ -148,7 +153,7 @@ class Command(BaseCommand):
             name="Test Resume",
             uploaded_by=user,
             content_type=content_type,
-            object_id=1,  # Generic foreign key
+            object_id=user.pk,
             type=UploadType.RESUME,
         )
 
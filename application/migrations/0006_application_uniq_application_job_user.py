@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """Keep the earliest application per job and user so the constraint can be added"""
+    Application = apps.get_model('application', 'Application')
+    duplicates = (
+        Application.objects.values('job_id', 'user_id')
+        .annotate(first_id=models.Min('id'), total=models.Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        Application.objects.filter(job_id=row['job_id'], user_id=row['user_id']).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0005_application_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'user'), name='uniq_application_job_user'),
+        ),
+    ]
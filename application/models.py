@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.db import models
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
 
 from job.models import Job
 from job_portal.settings import UPLOAD_MODEL
@@ -30,5 +31,40 @@ class Application(models.Model):
     resume = models.ForeignKey(UPLOAD_MODEL, on_delete=models.CASCADE, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # A talent's applications, newest first
+            models.Index(fields=["user", "-date_applied"], name="application_user_recent_idx"),
+            # Applications received for a job, by status
+            models.Index(fields=["job", "status"], name="application_job_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "user"], name="uniq_application_job_user"),
+        ]
+
+    @classmethod
+    def bulk_apply(cls, user, jobs, cover_letter, resume_id=None):
+        """
+        Apply the user to several jobs in batched INSERTs
+        Jobs the user has already applied to are skipped; returns the created applications
+        """
+        with transaction.atomic():
+            # Lock the user's row so concurrent bulk applies by the same user run one at a
+            # time; the applications read below are then exactly those that existed before
+            # this insert, and a job not among them is inserted by this call
+            get_user_model().objects.select_for_update().filter(pk=user.pk).first()
+            applied_job_ids = set(cls.objects.filter(user=user, job__in=jobs).values_list("job_id", flat=True))
+            applications = [
+                cls(job=job, user=user, cover_letter=cover_letter, resume_id=resume_id)
+                for job in jobs
+                if job.pk not in applied_job_ids
+            ]
+            # ignore_conflicts only guards against a concurrent single-job create, which takes no lock
+            cls.objects.bulk_create(applications, batch_size=500, ignore_conflicts=True)
+        return applications
+
     def __str__(self):
-        return self.job.title
+        # Only use the job title when it is already loaded, so logging an application never queries
+        if Application.job.is_cached(self):
+            return self.job.title
+        return f"Application #{self.pk} (job_id={self.job_id})"
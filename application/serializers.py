@@ -2,26 +2,77 @@
 Application  Serializers
 """
 
-from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 from rest_framework import serializers
 
 from application.models import Application, ApplicationStatus
+from core.serializers import CachedFieldsModelSerializer
+from job.models import Job
 from job.serializers import JobSerializer
 from upload.models import Upload, UploadType
 from upload.serializers import UploadSerializer
-from user.models.models import User, UserRole
 from user.serializers import UserSerializer
 
+APPLICATION_DETAIL_FIELDS = (
+    "id",
+    "job_details",
+    "user_details",
+    "status",
+    "date_applied",
+    "cover_letter",
+    "updated_at",
+    "resume_details",
+)
 
-class ApplicationSerializer(serializers.ModelSerializer):
+
+def get_user_resume(user):
     """
-    Serializer for the application model
-    Backward compatible - resume attachment is optional
+    Get the user's most recent resume upload
+    Returns None if no resume found
+    """
+    try:
+        # Find the most recent resume upload for this user
+        return Upload.objects.filter(uploaded_by=user, type=UploadType.RESUME).order_by("-created_at").first()
+    except Exception:
+        # If any error occurs, return None (no resume)
+        return None
+
+
+def get_user_resume_id(user):
+    """
+    Get the id of the user's most recent resume upload without loading the row
+    Returns None if no resume found
+    """
+    return (
+        Upload.objects.filter(uploaded_by_id=user.pk, type=UploadType.RESUME)
+        .order_by("-created_at")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+class BaseApplicationSerializer(CachedFieldsModelSerializer):
+    """
+    Base serializer for the application model
+    Holds the nested job, user and resume details shared by every application serializer
     """
 
     job_details = JobSerializer(source="job", read_only=True)
     user_details = UserSerializer(source="user", read_only=True)
-    resume_details = serializers.SerializerMethodField()
+    resume_details = UploadSerializer(source="resume", read_only=True)
+
+    class Meta:
+        model = Application
+        fields = APPLICATION_DETAIL_FIELDS
+        read_only_fields = ("updated_at", "date_applied", "id")
+
+
+class ApplicationSerializer(BaseApplicationSerializer):
+    """
+    Serializer for the application model
+    Backward compatible - resume attachment is optional
+    """
+
     resume = serializers.PrimaryKeyRelatedField(
         queryset=Upload.objects.all(),
         required=False,
@@ -29,8 +80,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
         help_text="Optional resume upload ID. If not provided, will automatically attach user's most recent resume.",
     )
 
-    class Meta:
-        model = Application
+    class Meta(BaseApplicationSerializer.Meta):
         fields = (
             "id",
             "job",
@@ -47,181 +97,60 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
         read_only_fields = ("updated_at", "status", "date_applied", "id")
         required_fields = ("job", "user")
-
-    def get_resume_details(self, obj):
-        """Get the resume details for the application"""
-        if obj.resume:
-            return UploadSerializer(obj.resume).data
-        return None
+        # uniq_application_job_user is enforced by the INSERT itself (see ApplicationsViewSet.create);
+        # the generated validator would re-query and make "user" a required field
+        validators = []
 
     def create(self, validated_data):
         """
         Create application with optional resume attachment
         Maintains backward compatibility - resume attachment is optional
         """
-        user = validated_data.get("user")
-        job = validated_data.get("job")
-
         # Only attach resume if not explicitly provided in the data
         if "resume" not in validated_data:
-            # Find user's most recent resume
-            resume = self._get_user_resume(user)
-            validated_data["resume"] = resume
+            validated_data["resume"] = get_user_resume(validated_data.get("user"))
 
-        # Create application
-        application = Application.objects.create(**validated_data)
+        return Application.objects.create(**validated_data)
 
-        return application
 
-    def _get_user_resume(self, user):
-        """
-        Get the user's most recent resume upload
-        Returns None if no resume found
-        """
-        try:
-            # Find the most recent resume upload for this user
-            resume = Upload.objects.filter(uploaded_by=user, type=UploadType.RESUME).order_by("-created_at").first()
-
-            return resume
-        except Exception:
-            # If any error occurs, return None (no resume)
-            return None
-
-
-class ApplicationCreateSerializer(serializers.ModelSerializer):
+class ApplicationCreateSerializer(ApplicationSerializer):
     """
     Serializer for creating applications with enhanced resume handling
     Backward compatible - extends ApplicationSerializer functionality
     """
 
-    job_details = JobSerializer(source="job", read_only=True)
-    user_details = UserSerializer(source="user", read_only=True)
-    resume_details = serializers.SerializerMethodField()
     resume_attached = serializers.SerializerMethodField()
-    resume = serializers.PrimaryKeyRelatedField(
-        queryset=Upload.objects.all(),
-        required=False,
-        allow_null=True,
-        help_text="Optional resume upload ID. If not provided, will automatically attach user's most recent resume.",
-    )
 
-    class Meta:
-        model = Application
-        fields = (
-            "id",
-            "job",
-            "job_details",
-            "user",
-            "user_details",
-            "status",
-            "date_applied",
-            "cover_letter",
-            "updated_at",
-            "resume",
-            "resume_details",
-            "resume_attached",
-        )
-        read_only_fields = ("updated_at", "status", "date_applied", "id")
-
-    def get_resume_details(self, obj):
-        """Get the resume details for the application"""
-        if obj.resume:
-            return UploadSerializer(obj.resume).data
-        return None
+    class Meta(ApplicationSerializer.Meta):
+        fields = ApplicationSerializer.Meta.fields + ("resume_attached",)
 
     def get_resume_attached(self, obj):
         """Check if a resume was attached to the application"""
-        return obj.resume is not None
+        return obj.resume_id is not None
 
     def create(self, validated_data):
         """
         Create application and automatically attach user's resume
         """
-        user = validated_data.get("user")
-        job = validated_data.get("job")
-
-        # Find user's most recent resume
-        resume = self._get_user_resume(user)
-
-        # Create application with resume
-        application = Application.objects.create(**validated_data, resume=resume)
-
-        return application
-
-    def _get_user_resume(self, user):
-        """
-        Get the user's most recent resume upload
-        Returns None if no resume found
-        """
-        try:
-            # Find the most recent resume upload for this user
-            resume = Upload.objects.filter(uploaded_by=user, type=UploadType.RESUME).order_by("-created_at").first()
+        validated_data["resume"] = get_user_resume(validated_data.get("user"))
 
-            return resume
-        except Exception:
-            # If any error occurs, return None (no resume)
-            return None
+        return Application.objects.create(**validated_data)
 
 
-class ApplicationUpdateSerializer(serializers.ModelSerializer):
+class ApplicationUpdateSerializer(BaseApplicationSerializer):
     """
     Serializer for updating applications (admin/recruiter use)
     """
 
-    job_details = JobSerializer(source="job", read_only=True)
-    user_details = UserSerializer(source="user", read_only=True)
-    resume_details = serializers.SerializerMethodField()
 
-    class Meta:
-        model = Application
-        fields = (
-            "id",
-            "job_details",
-            "user_details",
-            "status",
-            "date_applied",
-            "cover_letter",
-            "updated_at",
-            "resume_details",
-        )
-        read_only_fields = ("updated_at", "date_applied", "id")
-
-    def get_resume_details(self, obj):
-        """Get the resume details for the application"""
-        if obj.resume:
-            return UploadSerializer(obj.resume).data
-        return None
-
-
-class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
+class ApplicationStatusUpdateSerializer(BaseApplicationSerializer):
     """
     Serializer specifically for updating application status (recruiter/admin use)
     """
 
-    job_details = JobSerializer(source="job", read_only=True)
-    user_details = UserSerializer(source="user", read_only=True)
-    resume_details = serializers.SerializerMethodField()
-
-    class Meta:
-        model = Application
-        fields = (
-            "id",
-            "job_details",
-            "user_details",
-            "status",
-            "date_applied",
-            "cover_letter",
-            "updated_at",
-            "resume_details",
-        )
+    class Meta(BaseApplicationSerializer.Meta):
         read_only_fields = ("updated_at", "date_applied", "id", "cover_letter")
 
-    def get_resume_details(self, obj):
-        """Get the resume details for the application"""
-        if obj.resume:
-            return UploadSerializer(obj.resume).data
-        return None
-
 
 class ApplicationStatusUpdateRequestSerializer(serializers.Serializer):
     """
@@ -229,3 +158,28 @@ class ApplicationStatusUpdateRequestSerializer(serializers.Serializer):
     """
 
     status = serializers.ChoiceField(choices=ApplicationStatus.choices, help_text="New status for the application")
+
+
+class ApplicationBulkApplyRequestSerializer(serializers.Serializer):
+    """
+    Request serializer for applying to several jobs at once
+    """
+
+    jobs = serializers.PrimaryKeyRelatedField(
+        queryset=Job.objects.all(), many=True, allow_empty=False, help_text="IDs of the jobs to apply to"
+    )
+    cover_letter = serializers.CharField(help_text="Cover letter sent with every application")
+    resume = serializers.PrimaryKeyRelatedField(
+        queryset=Upload.objects.all(),
+        required=False,
+        allow_null=True,
+        help_text="Optional resume upload ID. If not provided, will automatically attach user's most recent resume.",
+    )
+
+    def validate_jobs(self, jobs):
+        """Reject jobs whose close date has passed"""
+        now = timezone.now()
+        closed = [job.pk for job in jobs if job.close_date and job.close_date <= now]
+        if closed:
+            raise serializers.ValidationError(f"Jobs are closed for applications: {', '.join(map(str, closed))}")
+        return jobs
@@ -1,4 +1,7 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import render
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
@@ -8,15 +11,30 @@ from rest_framework.response import Response
 
 from application.models import Application, ApplicationStatus
 from application.serializers import (
+    ApplicationBulkApplyRequestSerializer,
     ApplicationCreateSerializer,
     ApplicationSerializer,
     ApplicationStatusUpdateRequestSerializer,
     ApplicationStatusUpdateSerializer,
     ApplicationUpdateSerializer,
+    get_user_resume_id,
 )
-from core.permissions_enhanced import IsAccountActive
+from core.permissions_enhanced import IsAccountActive, IsTalentOrAdmin
 from core.response import APIResponse
 
+VALID_APPLICATION_STATUSES = frozenset(ApplicationStatus.values)
+VALID_APPLICATION_STATUSES_DISPLAY = ", ".join(ApplicationStatus.values)
+
+# Applications visible to each role; unknown roles see none
+APPLICATION_SCOPE_BY_ROLE = {
+    # Admin can see all applications
+    "admin": lambda user: Q(),
+    # Talent users see only their own applications
+    "talent": lambda user: Q(user=user),
+    # Recruiters see applications for jobs they own (through their company)
+    "recruiter": lambda user: Q(job__company__user=user),
+}
+
 
 class ApplicationsViewSet(viewsets.ModelViewSet):
     """
@@ -79,23 +97,21 @@ class ApplicationsViewSet(viewsets.ModelViewSet):
             if "user" not in serializer.validated_data:
                 serializer.validated_data["user"] = request.user
 
-            # Check if user already applied for this job
-            job = serializer.validated_data.get("job")
-            user = serializer.validated_data.get("user")
-
-            if Application.objects.filter(job=job, user=user).exists():
+            # uniq_application_job_user rejects a second application for the same job
+            try:
+                with transaction.atomic():
+                    application = serializer.save()
+            except IntegrityError:
                 return APIResponse.error(
                     message="You have already applied for this job",
                     errors={"job": ["Application already exists for this job"]},
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
 
-            application = serializer.save()
-
             # Enhanced response for resume attachment
             use_enhanced = request.query_params.get("enhanced_resume", "false").lower() == "true"
             if use_enhanced:
-                resume_attached = application.resume is not None
+                resume_attached = application.resume_id is not None
                 resume_message = (
                     "Resume attached successfully"
                     if resume_attached
@@ -111,6 +127,42 @@ class ApplicationsViewSet(viewsets.ModelViewSet):
                 message="Failed to create application", errors=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST
             )
 
+    @extend_schema(
+        operation_id="application_bulk_apply",
+        summary="Apply to Multiple Jobs",
+        description="Apply the current user to several jobs in one request (talent/admin only). Jobs already applied to are skipped and closed jobs are rejected. Resume is optional - if not provided, will automatically attach user's most recent resume.",
+        request=ApplicationBulkApplyRequestSerializer,
+        responses={
+            201: OpenApiTypes.OBJECT,
+            400: OpenApiTypes.OBJECT,
+            403: OpenApiTypes.OBJECT,
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="bulk", permission_classes=[IsTalentOrAdmin])
+    def bulk_apply(self, request):
+        """
+        Apply the current user to several jobs at once
+        """
+        serializer = ApplicationBulkApplyRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse.error(
+                message="Failed to create applications", errors=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = serializer.validated_data
+        if "resume" in data:
+            resume_id = data["resume"].pk if data["resume"] else None
+        else:
+            # Only the FK is stored and nothing is rendered, so the resume row is never loaded
+            resume_id = get_user_resume_id(request.user)
+        applications = Application.bulk_apply(request.user, data["jobs"], data["cover_letter"], resume_id)
+
+        return APIResponse.success(
+            data={"created": len(applications), "job_ids": [application.job_id for application in applications]},
+            message=f"{len(applications)} application(s) created successfully",
+            status_code=status.HTTP_201_CREATED,
+        )
+
     @extend_schema(
         operation_id="application_update_status",
         summary="Update Application Status",
@@ -129,17 +181,9 @@ class ApplicationsViewSet(viewsets.ModelViewSet):
         Update application status (recruiter/admin only)
         """
         try:
-            application = self.get_object()
-
-            # Check if user has permission to update this application
+            # Check if user has permission to update application status
             user = request.user
-            if user.role == "recruiter":
-                # Recruiters can only update applications for their company's jobs
-                if application.job.company.user != user:
-                    return APIResponse.error(
-                        message="You don't have permission to update this application", status_code=status.HTTP_403_FORBIDDEN
-                    )
-            elif user.role not in ["admin", "recruiter"]:
+            if user.role not in ["admin", "recruiter"]:
                 return APIResponse.error(
                     message="Only recruiters and admins can update application status", status_code=status.HTTP_403_FORBIDDEN
                 )
@@ -154,20 +198,26 @@ class ApplicationsViewSet(viewsets.ModelViewSet):
                 )
 
             # Validate status choice
-            valid_statuses = [choice[0] for choice in ApplicationStatus.choices]
-            if new_status not in valid_statuses:
+            if new_status not in VALID_APPLICATION_STATUSES:
                 return APIResponse.error(
                     message="Invalid status",
-                    errors={"status": [f"Must be one of: {', '.join(valid_statuses)}"]},
+                    errors={"status": [f"Must be one of: {VALID_APPLICATION_STATUSES_DISPLAY}"]},
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Update the application status
-            application.status = new_status
-            application.save()
+            # Update the application status in one statement; get_queryset scopes recruiters
+            # to their company's jobs, so the ownership check is part of the WHERE clause
+            updated = self.get_queryset().filter(pk=pk).update(status=new_status, updated_at=timezone.now())
+            if not updated:
+                # Nothing in scope matched; tell a missing application apart from another company's
+                if not Application.objects.filter(pk=pk).exists():
+                    raise Application.DoesNotExist
+                return APIResponse.error(
+                    message="You don't have permission to update this application", status_code=status.HTTP_403_FORBIDDEN
+                )
 
             # Return updated application data
-            serializer = ApplicationStatusUpdateSerializer(application)
+            serializer = ApplicationStatusUpdateSerializer(self.get_object())
             return APIResponse.success(
                 data=serializer.data, message=f"Application status updated to {new_status}", status_code=status.HTTP_200_OK
             )
@@ -189,16 +239,18 @@ class ApplicationsViewSet(viewsets.ModelViewSet):
         - ADMIN users see all applications
         """
         user = self.request.user
-
-        if user.role == "admin":
-            # Admin can see all applications
-            return Application.objects.all()
-        elif user.role == "talent":
-            # Talent users see only their own applications
-            return Application.objects.filter(user=user)
-        elif user.role == "recruiter":
-            # Recruiters see applications for jobs they own (through their company)
-            return Application.objects.filter(job__company__user=user)
-        else:
+        scope = APPLICATION_SCOPE_BY_ROLE.get(user.role)
+        if scope is None:
             # Default fallback - return empty queryset for unknown roles
             return Application.objects.none()
+
+        # The serializers nest the job (with its company, city hierarchy, categories and skills),
+        # the applicant and the resume, so load them per page instead of per row
+        return (
+            Application.objects.filter(scope(user))
+            .select_related("job__company", "job__city__state__country", "user", "resume__content_type")
+            .prefetch_related("job__jobcategory_set__category", "job__jobskill_set__skill")
+            # The applicant's password hash is never rendered
+            .defer("user__password")
+            .order_by("-date_applied")
+        )
@@ -154,15 +154,16 @@ def interactive_create():
 
 def show_existing_addresses():
     """Show existing addresses in the database"""
-    addresses = Address.objects.select_related("city__state__country").all()
+    # The names are denormalized onto Address, so the hierarchy does not need joining
+    addresses = Address.objects.select_related("content_type")
 
     print(f"\n=== Existing Addresses ({addresses.count()}) ===")
     for addr in addresses:
         print(f"ID: {addr.id}")
         print(f"Location: {addr.location}")
-        print(f"City: {addr.city.name}")
-        print(f"State: {addr.city.state.name}")
-        print(f"Country: {addr.city.state.country.name} ({addr.city.state.country.code})")
+        print(f"City: {addr.city_name}")
+        print(f"State: {addr.state_name}")
+        print(f"Country: {addr.country_name} ({addr.country_code})")
         print(f"ZIP: {addr.zip_code}")
         print(f"Content Type: {addr.content_type}")
         print(f"Object ID: {addr.object_id}")
@@ -0,0 +1,27 @@
+"""
+Renderers for the job portal API
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, for endpoints returning plain dicts/lists
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data to JSON bytes, deferring unsupported types to DRF's encoder
+
+        Dates and times are passed through to that encoder too, so they are
+        formatted exactly as JSONRenderer formats them (e.g. "Z" for UTC).
+        """
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
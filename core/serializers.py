@@ -0,0 +1,27 @@
+"""
+Shared serializer base classes for the job portal API
+"""
+
+import copy
+
+from rest_framework import serializers
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that builds its field tree once per class
+
+    ModelSerializer.get_fields() introspects the model and deep-copies the
+    declared fields on every instantiation. Here the result is kept on the
+    class and each instance gets shallow copies of the fields, which is
+    enough for bind() to attach them to the new serializer. Only use this for
+    serializers whose fields do not depend on the instance or context.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        cached_fields = cls.__dict__.get("_cached_fields")
+        if cached_fields is None:
+            cached_fields = super().get_fields()
+            cls._cached_fields = cached_fields
+        return {name: copy.copy(field) for name, field in cached_fields.items()}
@@ -3,6 +3,7 @@ Specific fixes for viewsets with critical permission issues.
 These can be directly applied to fix the most urgent security vulnerabilities.
 """
 
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import permissions
 
 from core.permissions_enhanced import (
@@ -56,17 +57,20 @@ def get_upload_permissions(self):
     return [permission() for permission in permission_classes]
 
 
+# Permission classes hold no per-request state, so the address and location
+# viewsets share one instance list per branch instead of building them on every request
+_ADDRESS_OWNER_PERMISSIONS = [IsAddressOwnerOrStaff()]
+_AUTHENTICATED_PERMISSIONS = [permissions.IsAuthenticated()]
+_ADMIN_ONLY_PERMISSIONS = [IsAdminOnly()]
+
+
 def get_address_permissions(self):
     """
     Permission method for AddressViewSet
     """
     if self.action in ["list", "retrieve", "update", "partial_update", "destroy"]:
-        permission_classes = [IsAddressOwnerOrStaff]
-    elif self.action == "create":
-        permission_classes = [permissions.IsAuthenticated]
-    else:
-        permission_classes = [permissions.IsAuthenticated]
-    return [permission() for permission in permission_classes]
+        return _ADDRESS_OWNER_PERMISSIONS
+    return _AUTHENTICATED_PERMISSIONS
 
 
 def get_job_skill_permissions(self):
@@ -87,10 +91,8 @@ def get_city_state_country_permissions(self):
     Permission method for CityViewSet, StateViewSet, CountryViewSet
     """
     if self.action in ["create", "update", "partial_update", "destroy"]:
-        permission_classes = [IsAdminOnly]
-    else:
-        permission_classes = [permissions.IsAuthenticated]
-    return [permission() for permission in permission_classes]
+        return _ADMIN_ONLY_PERMISSIONS
+    return _AUTHENTICATED_PERMISSIONS
 
 
 # Queryset filtering methods
@@ -133,7 +135,9 @@ def get_address_queryset(self):
     if self.request.user.is_staff:
         return self.queryset
     else:
-        return self.queryset.filter(user=self.request.user)
+        # Addresses are owned through their generic key, which leads the uniq_address index
+        user_type = ContentType.objects.get_for_model(self.request.user)
+        return self.queryset.filter(content_type=user_type, object_id=self.request.user.pk)
 
 
 def get_job_skill_queryset(self):
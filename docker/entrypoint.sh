@@ -5,7 +5,8 @@ echo "Running database migrations..."
 python manage.py migrate --noinput --run-syncdb
 python manage.py collectstatic --noinput || true
 
-exec gunicorn job_portal.wsgi:application \
+exec gunicorn job_portal.asgi:application \
+  --worker-class uvicorn_worker.UvicornWorker \
   --bind 0.0.0.0:8000 \
   --workers ${GUNICORN_WORKERS:-3} \
   --timeout ${GUNICORN_TIMEOUT:-60}
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
+import logging
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -80,6 +82,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "adrf",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     "django_filters",
@@ -117,6 +120,13 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Report lazy relation loads (N+1 queries) during development when nplusone is installed
+NPLUSONE_ENABLED = DEBUG and importlib.util.find_spec("nplusone") is not None
+if NPLUSONE_ENABLED:
+    INSTALLED_APPS.append("nplusone.ext.django")
+    MIDDLEWARE.insert(0, "nplusone.ext.django.NPlusOneMiddleware")
+    NPLUSONE_LOG_LEVEL = logging.WARN
+
 ROOT_URLCONF = "job_portal.urls"
 
 TEMPLATES = [
@@ -135,6 +145,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "job_portal.wsgi.application"
+ASGI_APPLICATION = "job_portal.asgi.application"
 
 
 # Database
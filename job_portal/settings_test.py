@@ -1,4 +1,5 @@
 import importlib
+import importlib.util
 import sys
 
 from .settings import *
@@ -25,3 +26,10 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 MIGRATION_MODULES = {app.split(".")[0]: None for app in INSTALLED_APPS}
 DISABLE_SIGNAL_EMISSION = True
 DEBUG = False
+
+# Fail tests on lazy relation loads when nplusone is installed
+if importlib.util.find_spec("nplusone") is not None:
+    if "nplusone.ext.django" not in INSTALLED_APPS:
+        INSTALLED_APPS.append("nplusone.ext.django")
+        MIDDLEWARE.insert(0, "nplusone.ext.django.NPlusOneMiddleware")
+    NPLUSONE_RAISE = True
@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_portal.settings")
 
 application = get_wsgi_application()
+
+# Import every URLconf/view module and build the resolver's reverse lookup at
+# worker boot, so the first request each worker serves doesn't pay for it
+get_resolver().reverse_dict
@@ -17,7 +17,8 @@ python manage.py collectstatic --noinput
 
 # Start the application
 echo "Starting Gunicorn server..."
-exec gunicorn job_portal.wsgi:application \
+exec gunicorn job_portal.asgi:application \
+  --worker-class uvicorn_worker.UvicornWorker \
   --bind 0.0.0.0:$PORT \
   --workers=3 \
   --timeout=60
@@ -0,0 +1,533 @@
+import json
+import tempfile
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from address import services
+from address.models import Address, City, Country, State
+from address.serializers import AddressSearchSerializer
+from address.services import AddressLookupService, AddressService, address_service
+
+User = get_user_model()
+
+
+class AddressTestCase(TestCase):
+    """Shared fixtures: one city and a user owning addresses through the generic key."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(name="Kenya", code="KE")
+        cls.state = State.objects.create(name="Nairobi County", country=cls.country)
+        cls.city = City.objects.create(name="Nairobi", state=cls.state)
+        cls.user = User.objects.create_user(
+            username="owner",
+            email="owner@example.com",
+            password="secret-pass-123",
+            first_name="Ow",
+            last_name="Ner",
+            role="talent",
+            status="active",
+        )
+        cls.user_type = ContentType.objects.get_for_model(User)
+
+    def setUp(self):
+        cache.clear()
+        services._local_lookup_cache.clear()
+        services._location_index = None
+
+    def address_data(self, **overrides):
+        data = {
+            "city_id": self.city.pk,
+            "location": "1 Moi Avenue",
+            "zip_code": "00100",
+            "content_type_id": self.user_type.pk,
+            "object_id": self.user.pk,
+        }
+        data.update(overrides)
+        return data
+
+
+class TestLookupCacheInvalidation(AddressTestCase):
+    """Test that cached reference data lookups follow Country/State/City changes."""
+
+    def test_new_country_invalidates_cached_countries(self):
+        """Test that saving a country bumps the lookup version so the next read sees it."""
+        self.assertEqual([country["code"] for country in AddressLookupService.get_countries()], ["KE"])
+
+        Country.objects.create(name="Uganda", code="UG")
+
+        self.assertEqual([country["code"] for country in AddressLookupService.get_countries()], ["KE", "UG"])
+
+    def test_renamed_state_invalidates_cached_states(self):
+        """Test that renaming a state is visible through the cached states lookup."""
+        AddressLookupService.get_states_by_country(self.country.pk)
+
+        State.objects.filter(pk=self.state.pk).update(name="Nairobi Metro")
+        # update() sends no signal, so the stale entry is still served
+        self.assertEqual(AddressLookupService.get_states_by_country(self.country.pk)[0]["name"], "Nairobi County")
+
+        state = State.objects.get(pk=self.state.pk)
+        state.save()
+        self.assertEqual(AddressLookupService.get_states_by_country(self.country.pk)[0]["name"], "Nairobi Metro")
+
+
+class TestDenormalizedHierarchy(AddressTestCase):
+    """Test that Address keeps its hierarchy keys and names in step with City/State/Country."""
+
+    def setUp(self):
+        super().setUp()
+        self.address = Address.objects.create(
+            city=self.city,
+            location="1 Moi Avenue",
+            zip_code="00100",
+            content_type=self.user_type,
+            object_id=self.user.pk,
+        )
+
+    def assertHierarchy(self, city, state, country):
+        self.address.refresh_from_db()
+        self.assertEqual(
+            (self.address.city_id, self.address.state_id, self.address.country_id), (city.pk, state.pk, country.pk)
+        )
+        self.assertEqual(
+            (self.address.city_name, self.address.state_name, self.address.country_name, self.address.country_code),
+            (city.name, state.name, country.name, country.code),
+        )
+        self.assertEqual(self.address.full_address, f"1 Moi Avenue, {city.name}, {state.name}, {country.name} 00100")
+
+    def test_save_copies_the_city_hierarchy(self):
+        """Test that a new address takes its keys and names from its city."""
+        self.assertHierarchy(self.city, self.state, self.country)
+
+    def test_country_rename_is_propagated(self):
+        """Test that renaming a country rewrites the names on its addresses."""
+        self.country.name = "Republic of Kenya"
+        self.country.save()
+
+        self.assertHierarchy(self.city, self.state, self.country)
+
+    def test_state_move_is_propagated(self):
+        """Test that moving a state to another country updates country_id as well as the names."""
+        uganda = Country.objects.create(name="Uganda", code="UG")
+        state = State.objects.get(pk=self.state.pk)
+        state.country = uganda
+        state.save()
+
+        self.assertHierarchy(self.city, state, uganda)
+
+    def test_city_move_is_propagated(self):
+        """Test that moving a city to another state updates state_id and country_id."""
+        uganda = Country.objects.create(name="Uganda", code="UG")
+        central = State.objects.create(name="Central", country=uganda)
+        city = City.objects.get(pk=self.city.pk)
+        city.state = central
+        city.save()
+
+        self.assertHierarchy(city, central, uganda)
+
+    def test_save_loads_the_hierarchy_in_one_query(self):
+        """Test that saving with only city_id set loads city, state and country together."""
+        address = Address(
+            city_id=self.city.pk,
+            location="2 Moi Avenue",
+            zip_code="00100",
+            content_type=self.user_type,
+            object_id=self.user.pk,
+        )
+
+        # One SELECT for the hierarchy, one INSERT
+        with self.assertNumQueries(2):
+            address.save()
+        self.assertEqual(address.country_name, "Kenya")
+
+        # The hierarchy is now cached on the instance
+        with self.assertNumQueries(1):
+            address.save()
+
+
+class TestAddressSerializerCreate(APITestCase, AddressTestCase):
+    """Test POST /api/addresses/ with the hierarchy derived from the city."""
+
+    def test_state_and_country_come_from_the_city(self):
+        """Test that only city_id is needed and the keys are taken from its hierarchy."""
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            "/api/addresses/",
+            {
+                "city_id": self.city.pk,
+                "location": "1 Moi Avenue",
+                "zip_code": "00100",
+                "content_type": "user",
+                "object_id": self.user.pk,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["country_name"], "Kenya")
+        address = Address.objects.get(pk=response.data["id"])
+        self.assertEqual((address.state_id, address.country_id), (self.state.pk, self.country.pk))
+
+
+class TestSearchAddresses(AddressTestCase):
+    """Test AddressService.search_addresses filters on the address's own hierarchy keys."""
+
+    def test_country_filter_follows_a_moved_state(self):
+        """Test that after a state moves country, its addresses are found under the new country only."""
+        address, _ = address_service.get_or_create_address(self.address_data())
+        uganda = Country.objects.create(name="Uganda", code="UG")
+        state = State.objects.get(pk=self.state.pk)
+        state.country = uganda
+        state.save()
+
+        self.assertEqual(list(address_service.search_addresses("", {"country_id": uganda.pk})), [address])
+        self.assertFalse(address_service.search_addresses("", {"country_id": self.country.pk}).exists())
+        self.assertEqual(list(address_service.search_addresses("Uganda", {"state_id": self.state.pk})), [address])
+
+
+class TestSearchLocations(AddressTestCase):
+    """Test AddressLookupService.search_locations over the in-memory location index."""
+
+    def test_short_query_matches_inside_names(self):
+        """Test that a two-character query finds names containing it, as the icontains search did."""
+        City.objects.create(name="London", state=self.state)
+
+        results = AddressLookupService.search_locations("nd")
+
+        self.assertEqual([result["name"] for result in results], ["London"])
+        self.assertEqual(results[0]["full_name"], "London, Nairobi County, Kenya")
+
+    def test_new_city_is_found_after_invalidation(self):
+        """Test that the index is rebuilt once the lookup cache version moves."""
+        self.assertEqual(AddressLookupService.search_locations("Mombasa"), [])
+
+        City.objects.create(name="Mombasa", state=self.state)
+
+        self.assertEqual([result["name"] for result in AddressLookupService.search_locations("Mombasa")], ["Mombasa"])
+
+    def test_repeated_queries_are_served_from_the_cache(self):
+        """Test that the same (query, limit), even with no results, is only searched once."""
+        with mock.patch.object(
+            AddressLookupService, "_search_locations", wraps=AddressLookupService._search_locations
+        ) as search:
+            for _ in range(2):
+                AddressLookupService.search_locations("Nai")
+                AddressLookupService.search_locations("NAI")
+                AddressLookupService.search_locations("Zanzibar")
+            AddressLookupService.search_locations("Nai", limit=5)
+
+        self.assertEqual(search.call_args_list, [mock.call("Nai", 20), mock.call("Zanzibar", 20), mock.call("Nai", 5)])
+
+
+class TestAddressSearchSerializer(AddressTestCase):
+    """Test that AddressSearchSerializer checks the location IDs with one query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_country = Country.objects.create(name="Uganda", code="UG")
+        cls.other_state = State.objects.create(name="Central", country=cls.other_country)
+
+    def validate(self, **data):
+        serializer = AddressSearchSerializer(data=data)
+        with self.assertNumQueries(1 if data else 0):
+            serializer.is_valid()
+        return serializer.errors
+
+    def test_consistent_ids_are_valid(self):
+        """Test that a matching city, state and country pass in one query."""
+        for data in (
+            {"city_id": self.city.pk, "state_id": self.state.pk, "country_id": self.country.pk},
+            {"state_id": self.state.pk, "country_id": self.country.pk},
+            {"country_id": self.country.pk},
+            {},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self.validate(**data), {})
+
+    def test_missing_ids_are_rejected(self):
+        """Test that an unknown ID is reported against its own field."""
+        for field in ("city_id", "state_id", "country_id"):
+            with self.subTest(field=field):
+                self.assertEqual(list(self.validate(**{field: 10_000})), [field])
+
+    def test_mismatched_ids_are_rejected(self):
+        """Test that IDs from different hierarchies are reported against the less specific field."""
+        self.assertEqual(list(self.validate(city_id=self.city.pk, state_id=self.other_state.pk)), ["state_id"])
+        self.assertEqual(list(self.validate(city_id=self.city.pk, country_id=self.other_country.pk)), ["country_id"])
+        self.assertEqual(list(self.validate(state_id=self.state.pk, country_id=self.other_country.pk)), ["country_id"])
+
+
+class TestUniqueAddress(AddressTestCase):
+    """Test the uniq_address constraint and AddressService.get_or_create_address."""
+
+    def test_get_or_create_returns_existing_address(self):
+        """Test that a second call with the same owner and address reuses the row."""
+        address, created = address_service.get_or_create_address(self.address_data())
+        again, created_again = address_service.get_or_create_address(self.address_data())
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(address.pk, again.pk)
+        self.assertEqual(Address.objects.count(), 1)
+
+    def test_get_or_create_keeps_owners_apart(self):
+        """Test that the same street address for another owner is a separate row."""
+        address, _ = address_service.get_or_create_address(self.address_data())
+        other, created = address_service.get_or_create_address(self.address_data(object_id=self.user.pk + 1))
+
+        self.assertTrue(created)
+        self.assertNotEqual(address.pk, other.pk)
+
+    def test_get_or_create_requires_owner(self):
+        """Test that content_type_id and object_id are both required."""
+        for missing in ("content_type_id", "object_id"):
+            with self.subTest(missing=missing):
+                with self.assertRaises(ValueError):
+                    address_service.get_or_create_address(self.address_data(**{missing: None}))
+        self.assertFalse(Address.objects.exists())
+
+    def test_constraint_rejects_duplicates(self):
+        """Test that inserting the same owner, city, location and zip code twice fails."""
+        address_service.get_or_create_address(self.address_data())
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Address.objects.create(
+                city=self.city,
+                location="1 Moi Avenue",
+                zip_code="00100",
+                content_type=self.user_type,
+                object_id=self.user.pk,
+            )
+
+
+class TestPopulateAddress(AddressTestCase):
+    """Test the populate_address bulk import."""
+
+    record = {
+        "country_name": "Kenya",
+        "country_code": "KE",
+        "state_name": "Nairobi County",
+        "city_name": "Nairobi",
+        "location": "2 Moi Avenue",
+        "zip_code": "00100",
+    }
+
+    def import_records(self, records, stdout=None, **options):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as json_file:
+            json.dump(records, json_file)
+            json_file.flush()
+            call_command("populate_address", json_file=json_file.name, stdout=stdout or StringIO(), **options)
+
+    def import_stdin(self, records, stdout=None, **options):
+        stdin = TextIOWrapper(BytesIO(json.dumps(records).encode()))
+        with mock.patch("sys.stdin", stdin):
+            call_command("populate_address", stdin_json=True, stdout=stdout or StringIO(), **options)
+
+    def test_dry_run_writes_nothing(self):
+        """Test that --dry-run validates and reports JSON records from a file or stdin without saving them."""
+        for name, run_import in (("json_file", self.import_records), ("stdin_json", self.import_stdin)):
+            for records in ([self.record], [self.record, {**self.record, "location": "3 Moi Avenue"}]):
+                with self.subTest(source=name, count=len(records)):
+                    output = StringIO()
+                    run_import(records, stdout=output, dry_run=True)
+
+                    self.assertEqual(output.getvalue().count("DRY RUN"), len(records))
+                    self.assertFalse(Address.objects.exists())
+
+    def test_stdin_import_creates_addresses(self):
+        """Test that records piped on stdin are created without --dry-run."""
+        self.import_stdin([self.record, {**self.record, "location": "3 Moi Avenue"}])
+
+        self.assertEqual(Address.objects.count(), 2)
+
+    def test_bulk_import_skips_existing_addresses(self):
+        """Test that re-running a JSON import skips rows it already created."""
+        records = [self.record, {**self.record, "location": "3 Moi Avenue"}]
+        self.import_records(records)
+        output = StringIO()
+        self.import_records(records, stdout=output)
+
+        self.assertEqual(Address.objects.count(), 2)
+        self.assertIn("Skipped 2 duplicate addresses", output.getvalue())
+
+    def test_bulk_import_invalidates_after_commit(self):
+        """Test that the bulk import, which sends no signals, bumps the version once it commits."""
+        AddressLookupService.get_countries()
+        records = [
+            {
+                "country_name": "Tanzania",
+                "country_code": "TZ",
+                "state_name": "Dar es Salaam",
+                "city_name": "Dar es Salaam",
+                "location": location,
+                "zip_code": "11101",
+            }
+            for location in ("1 Samora Avenue", "2 Samora Avenue")
+        ]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.import_records(records)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertIn("TZ", [country["code"] for country in AddressLookupService.get_countries()])
+
+
+class TestAddressHierarchy(APITestCase, AddressTestCase):
+    """Test the async address hierarchy lookup."""
+
+    def test_endpoint_returns_filtered_hierarchy(self):
+        """Test that GET /api/addresses/lookup/hierarchy/ narrows states and cities to the country."""
+        other = Country.objects.create(name="Uganda", code="UG")
+        State.objects.create(name="Central", country=other)
+
+        response = self.client.get("/api/addresses/lookup/hierarchy/", {"country_id": self.country.pk})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([country["code"] for country in data["countries"]], ["KE", "UG"])
+        self.assertEqual(data["states"], [{"id": self.state.pk, "name": "Nairobi County", "country_id": self.country.pk}])
+        self.assertEqual(data["cities"], [{"id": self.city.pk, "name": "Nairobi", "state_id": self.state.pk}])
+
+    def test_database_errors_propagate(self):
+        """Test that a failing query raises instead of returning empty lists, and nothing is cached."""
+        with mock.patch.object(AddressService, "_fetch_states", side_effect=DatabaseError("down")):
+            with self.assertRaises(DatabaseError):
+                async_to_sync(address_service.aget_address_hierarchy)(self.country.pk)
+
+        self.assertIsNone(services.get_local_lookup("hierarchy", self.country.pk, None))
+
+
+class TestAddressStatistics(AddressTestCase):
+    """Test that address statistics are served stale-while-revalidate."""
+
+    def setUp(self):
+        super().setUp()
+        address_service.get_or_create_address(self.address_data())
+        patcher = mock.patch("address.tasks.refresh_address_statistics.delay")
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def expire_statistics(self):
+        entry = cache.get(services.STATISTICS_CACHE_KEY)
+        entry["refresh_at"] = 0
+        cache.set(services.STATISTICS_CACHE_KEY, entry)
+
+    def test_first_call_computes_and_caches(self):
+        """Test that a cold cache is filled synchronously with the current counts."""
+        stats = address_service.get_address_statistics()
+
+        self.assertEqual(stats["total_addresses"], 1)
+        self.assertEqual(stats["total_cities"], 1)
+        self.assertEqual(cache.get(services.STATISTICS_CACHE_KEY)["stats"], stats)
+        self.delay.assert_not_called()
+
+    def test_fresh_value_is_served_without_queries(self):
+        """Test that statistics within their refresh window come straight from the cache."""
+        address_service.get_address_statistics()
+
+        with self.assertNumQueries(0):
+            address_service.get_address_statistics()
+        self.delay.assert_not_called()
+
+    def test_stale_value_is_served_while_one_refresh_is_queued(self):
+        """Test that stale statistics are returned as-is and only the first caller queues a refresh."""
+        stale = address_service.get_address_statistics()
+        address_service.get_or_create_address(self.address_data(location="2 Moi Avenue"))
+        self.expire_statistics()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(address_service.get_address_statistics(), stale)
+            self.assertEqual(address_service.get_address_statistics(), stale)
+        self.delay.assert_called_once_with()
+
+        address_service.refresh_address_statistics()
+        self.assertEqual(address_service.get_address_statistics()["total_addresses"], 2)
+
+    def test_failed_queue_releases_the_refresh_lock(self):
+        """Test that a refresh that cannot be queued lets the next caller try again."""
+        address_service.get_address_statistics()
+        self.expire_statistics()
+        self.delay.side_effect = RuntimeError("broker down")
+
+        address_service.get_address_statistics()
+        address_service.get_address_statistics()
+
+        self.assertEqual(self.delay.call_count, 2)
+
+
+class TestAddressViewSetPagination(APITestCase, AddressTestCase):
+    """Test the page-number pagination of GET /api/addresses/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for index in range(25):
+            Address.objects.create(
+                city=cls.city,
+                location=f"{index} Moi Avenue",
+                zip_code="00100",
+                content_type=cls.user_type,
+                object_id=cls.user.pk,
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_first_page_has_count_and_default_page_size(self):
+        """Test that the list is paginated 20 per page with a total count."""
+        response = self.client.get("/api/addresses/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIn("page=2", response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_page_parameter_returns_remaining_rows(self):
+        """Test that ?page=2 returns the rest of the addresses."""
+        response = self.client.get("/api/addresses/", {"page": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+
+    def test_pages_are_ordered_by_id(self):
+        """Test that the two pages list every address once, in id order."""
+        ids = [
+            address["id"] for page in (1, 2) for address in self.client.get("/api/addresses/", {"page": page}).data["results"]
+        ]
+
+        self.assertEqual(ids, sorted(Address.objects.values_list("id", flat=True)))
+
+
+class TestCountriesLookupView(APITestCase, AddressTestCase):
+    """Test GET /api/addresses/lookup/countries/ against the versioned lookup cache."""
+
+    def test_cached_response_still_requires_authentication(self):
+        """Test that a lookup cached for one user is not served to anonymous requests."""
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/addresses/lookup/countries/").status_code, 200)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get("/api/addresses/lookup/countries/").status_code, 401)
+
+    def test_new_country_is_listed_immediately(self):
+        """Test that the endpoint reflects a country saved after the list was cached."""
+        self.client.force_authenticate(self.user)
+        self.client.get("/api/addresses/lookup/countries/")
+
+        Country.objects.create(name="Uganda", code="UG")
+
+        response = self.client.get("/api/addresses/lookup/countries/")
+        self.assertEqual([country["code"] for country in response.json()], ["KE", "UG"])
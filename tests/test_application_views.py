@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from address.models import City, Country, State
+from application.models import Application, ApplicationStatus
+from company.models import Company
+from job.models import Job
+
+User = get_user_model()
+
+
+def create_user(username, role):
+    """Create an active, verified user with the given role"""
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="secret-pass-123",
+        first_name=username.title(),
+        last_name="Tester",
+        role=role,
+        status="active",
+        is_email_verified=True,
+    )
+
+
+class ApplicationTestCase(APITestCase):
+    """Shared fixtures: two recruiters with a job each, and a talent user."""
+
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="Kenya", code="KE")
+        state = State.objects.create(name="Nairobi County", country=country)
+        cls.city = City.objects.create(name="Nairobi", state=state)
+
+        cls.recruiter = create_user("recruiter", "recruiter")
+        cls.other_recruiter = create_user("other_recruiter", "recruiter")
+        cls.talent = create_user("talent", "talent")
+
+        cls.company = Company.objects.create(name="Acme", user=cls.recruiter)
+        cls.other_company = Company.objects.create(name="Globex", user=cls.other_recruiter)
+        cls.job = cls.create_job(cls.company, "Backend Engineer")
+        cls.other_job = cls.create_job(cls.other_company, "Data Engineer")
+
+    @classmethod
+    def create_job(cls, company, title, close_date=None):
+        return Job.objects.create(
+            title=title, description="Build things", company=company, city=cls.city, close_date=close_date
+        )
+
+
+class TestApplicationUpdateStatus(ApplicationTestCase):
+    """Test PATCH /api/applications/<id>/status/."""
+
+    def setUp(self):
+        self.application = Application.objects.create(job=self.job, user=self.talent, cover_letter="Hello")
+
+    def patch_status(self, user, pk, new_status=ApplicationStatus.INTERVIEW):
+        self.client.force_authenticate(user)
+        return self.client.patch(f"/api/applications/{pk}/status/", {"status": new_status}, format="json")
+
+    def test_job_owner_updates_status(self):
+        """Test that the recruiter owning the job can change the status."""
+        response = self.patch_status(self.recruiter, self.application.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["status"], ApplicationStatus.INTERVIEW)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, ApplicationStatus.INTERVIEW)
+
+    def test_other_recruiter_is_forbidden(self):
+        """Test that a recruiter from another company gets 403 and the status is unchanged."""
+        response = self.patch_status(self.other_recruiter, self.application.pk)
+
+        self.assertEqual(response.status_code, 403)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, ApplicationStatus.APPLIED)
+
+    def test_talent_is_forbidden(self):
+        """Test that talent users cannot change application status."""
+        response = self.patch_status(self.talent, self.application.pk)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_missing_application_is_not_found(self):
+        """Test that an unknown application id gets 404."""
+        response = self.patch_status(self.recruiter, self.application.pk + 1000)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_status_is_rejected(self):
+        """Test that a status outside ApplicationStatus gets 400."""
+        response = self.patch_status(self.recruiter, self.application.pk, new_status="hired")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestApplicationBulkApply(ApplicationTestCase):
+    """Test POST /api/applications/bulk/."""
+
+    def bulk_apply(self, user, job_ids):
+        self.client.force_authenticate(user)
+        return self.client.post("/api/applications/bulk/", {"jobs": job_ids, "cover_letter": "Hello"}, format="json")
+
+    def test_creates_one_application_per_job(self):
+        """Test that each requested job gets an application for the current user."""
+        response = self.bulk_apply(self.talent, [self.job.pk, self.other_job.pk])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["data"]["created"], 2)
+        self.assertCountEqual(response.data["data"]["job_ids"], [self.job.pk, self.other_job.pk])
+        self.assertEqual(Application.objects.filter(user=self.talent).count(), 2)
+
+    def test_skips_jobs_already_applied_to(self):
+        """Test that existing applications are neither duplicated nor counted as created."""
+        Application.objects.create(job=self.job, user=self.talent, cover_letter="Earlier")
+
+        response = self.bulk_apply(self.talent, [self.job.pk, self.other_job.pk])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["data"]["created"], 1)
+        self.assertEqual(response.data["data"]["job_ids"], [self.other_job.pk])
+        self.assertEqual(Application.objects.filter(user=self.talent).count(), 2)
+
+    def test_rejects_closed_jobs(self):
+        """Test that a job past its close date fails validation and nothing is created."""
+        closed_job = self.create_job(self.company, "Closed Role", close_date=timezone.now() - timedelta(days=1))
+
+        response = self.bulk_apply(self.talent, [self.job.pk, closed_job.pk])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.filter(user=self.talent).exists())
+
+    def test_recruiters_cannot_bulk_apply(self):
+        """Test that only talent and admin users may apply."""
+        response = self.bulk_apply(self.recruiter, [self.other_job.pk])
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Application.objects.filter(user=self.recruiter).exists())
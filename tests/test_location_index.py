@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase
+
+from address.search import LocationIndex, normalize, split_search_limit, trigrams
+
+ENTRIES = [
+    ("city", 1, "London", "England, United Kingdom"),
+    ("city", 2, "Londonderry", "Northern Ireland, United Kingdom"),
+    ("city", 3, "New York", "New York, United States"),
+    ("city", 4, "Nairobi", "Nairobi County, Kenya"),
+    ("state", 10, "England", "United Kingdom"),
+    ("state", 11, "New York", "United States"),
+    ("country", 20, "United Kingdom", None),
+    ("country", 21, "Kenya", None),
+]
+
+
+class TestSearchHelpers(SimpleTestCase):
+    """Test the text helpers behind the location index."""
+
+    def test_normalize_collapses_case_and_punctuation(self):
+        """Test that punctuation and runs of whitespace become single spaces."""
+        self.assertEqual(normalize("  Saint-Louis,  MO "), "saint louis mo")
+
+    def test_normalize_keeps_non_ascii_letters(self):
+        """Test that accented letters stay part of their word."""
+        self.assertEqual(normalize("São Paulo"), "são paulo")
+
+    def test_trigrams_are_padded_per_word(self):
+        """Test that each word gets pg_trgm padding: two spaces before, one after."""
+        self.assertEqual(len(trigrams("ab")), 3)
+        self.assertEqual(trigrams("ab cd"), trigrams("cd ab"))
+
+    def test_split_search_limit_adds_up(self):
+        """Test that the per-type quotas always add up to the limit."""
+        for limit in range(1, 30):
+            with self.subTest(limit=limit):
+                self.assertEqual(sum(split_search_limit(limit).values()), limit)
+
+
+class TestLocationIndex(SimpleTestCase):
+    """Test LocationIndex.search against a fixed set of entries."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = LocationIndex(ENTRIES)
+
+    def search_names(self, query, limit=20):
+        return [(result["type"], result["name"]) for result in self.index.search(query, limit)]
+
+    def test_two_character_substring_matches(self):
+        """Test that a query shorter than a trigram still matches inside names, as icontains did."""
+        self.assertEqual(self.search_names("nd"), [("city", "London"), ("city", "Londonderry"), ("state", "England")])
+
+    def test_substring_inside_a_word_matches(self):
+        """Test that a query matching the middle of a name is found."""
+        self.assertEqual(self.search_names("ondo"), [("city", "London"), ("city", "Londonderry")])
+
+    def test_closer_names_rank_first(self):
+        """Test that matches are ordered by trigram similarity to the query."""
+        self.assertEqual(self.search_names("london"), [("city", "London"), ("city", "Londonderry")])
+
+    def test_query_spanning_words_matches(self):
+        """Test that a multi-word query matches across the words of a name."""
+        self.assertEqual(self.search_names("ew yo"), [("city", "New York"), ("state", "New York")])
+
+    def test_case_and_punctuation_are_ignored(self):
+        """Test that the query is normalized like the indexed names."""
+        self.assertEqual(self.search_names("UNITED-kingdom"), [("country", "United Kingdom")])
+
+    def test_similar_names_without_the_substring_do_not_match(self):
+        """Test that trigram overlap alone is not a match."""
+        self.assertEqual(self.search_names("Londen"), [])
+
+    def test_results_respect_type_quotas(self):
+        """Test that each type is capped at its share of the limit."""
+        types = [entry_type for entry_type, _ in self.search_names("n", limit=4)]
+
+        self.assertEqual(types, ["city", "city", "state", "country"])
+
+    def test_result_includes_parent_and_full_name(self):
+        """Test the shape of a search result."""
+        self.assertEqual(
+            self.index.search("nairobi"),
+            [
+                {
+                    "type": "city",
+                    "id": 4,
+                    "name": "Nairobi",
+                    "parent": "Nairobi County, Kenya",
+                    "full_name": "Nairobi, Nairobi County, Kenya",
+                }
+            ],
+        )
+
+    def test_empty_query_returns_nothing(self):
+        """Test that a query without word characters matches nothing."""
+        self.assertEqual(self.index.search("--"), [])
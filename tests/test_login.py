@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APITestCase
+
+from upload.models import Upload, UploadType
+
+User = get_user_model()
+
+
+class TestLoginPayload(APITestCase):
+    """Test the user and uploads returned alongside the tokens on login."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="talent",
+            email="talent@example.com",
+            password="secret-pass-123",
+            first_name="Tal",
+            last_name="Ent",
+            role="talent",
+            phone="+254700000000",
+            status="active",
+        )
+        user_type = ContentType.objects.get_for_model(User)
+        # No files are written; the serializer tolerates missing files when reporting sizes
+        Upload.objects.bulk_create(
+            Upload(
+                file_path=f"public/uploads/resume-{index}.pdf",
+                name=f"Resume {index}",
+                uploaded_by=cls.user,
+                content_type=user_type,
+                object_id=cls.user.pk,
+                type=UploadType.RESUME,
+            )
+            for index in range(25)
+        )
+
+    def login(self, password="secret-pass-123"):
+        return self.client.post("/api/auth/login/", {"username": "talent", "password": password}, format="json")
+
+    def test_returns_tokens_with_full_user_profile(self):
+        """Test that login returns both tokens and every UserSerializer field."""
+        response = self.login()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        self.assertIn("access", data)
+        self.assertIn("refresh", data)
+        for key in ("id", "username", "email", "first_name", "last_name", "role", "phone", "status", "is_email_verified"):
+            self.assertIn(key, data["user"])
+        self.assertEqual(data["user"]["phone"], "+254700000000")
+        self.assertEqual(data["user"]["status"], "active")
+
+    def test_returns_every_upload_with_full_fields(self):
+        """Test that every upload is returned, with its owner and thumbnail keys."""
+        response = self.login()
+
+        uploads = response.data["data"]["uploads"]
+        self.assertEqual(len(uploads), 25)
+        self.assertCountEqual([upload["id"] for upload in uploads], Upload.objects.values_list("id", flat=True))
+        for key in ("thumbnail", "thumbnail_url", "uploaded_by", "content_type", "object_id", "file_url", "file_size"):
+            self.assertIn(key, uploads[0])
+        self.assertEqual(uploads[0]["content_type"], "user")
+        self.assertEqual(uploads[0]["object_id"], self.user.pk)
+
+    def test_invalid_credentials_are_rejected(self):
+        """Test that a wrong password gets 401 and no payload."""
+        response = self.login(password="wrong-password")
+
+        self.assertEqual(response.status_code, 401)
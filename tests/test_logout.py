@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+class TestLogoutAll(APITestCase):
+    """Test POST /api/auth/logout-all/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="talent", email="talent@example.com", password="secret-pass-123", role="talent", status="active"
+        )
+        cls.other_user = User.objects.create_user(
+            username="other", email="other@example.com", password="secret-pass-123", role="talent", status="active"
+        )
+
+    def logout_all(self):
+        self.client.force_authenticate(self.user)
+        return self.client.post("/api/auth/logout-all/")
+
+    def test_blacklists_every_session_of_the_user(self):
+        """Test that all of the user's refresh tokens are blacklisted, including ones already blacklisted."""
+        sessions = [RefreshToken.for_user(self.user) for _ in range(3)]
+        sessions[0].blacklist()
+
+        response = self.logout_all()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.filter(token__user=self.user).count(), 3)
+        refresh = self.client.post("/api/auth/refresh/", {"refresh": str(sessions[1])}, format="json")
+        self.assertEqual(refresh.status_code, 401)
+
+    def test_other_users_sessions_are_untouched(self):
+        """Test that only the requesting user's tokens are blacklisted."""
+        RefreshToken.for_user(self.user)
+        RefreshToken.for_user(self.other_user)
+
+        self.logout_all()
+
+        self.assertFalse(BlacklistedToken.objects.filter(token__user=self.other_user).exists())
+
+    def test_inserts_all_tokens_at_once(self):
+        """Test that the query count does not grow with the number of sessions."""
+        for _ in range(5):
+            RefreshToken.for_user(self.user)
+        self.client.force_authenticate(self.user)
+
+        # One select for the tokens not yet blacklisted and one bulk insert
+        with self.assertNumQueries(2):
+            self.client.post("/api/auth/logout-all/")
+
+        self.assertFalse(OutstandingToken.objects.filter(user=self.user, blacklistedtoken__isnull=True).exists())
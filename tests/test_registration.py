@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class TestRegistrationEmail(APITestCase):
+    """Test that POST /api/auth/register/ queues the verification email only once the user is committed."""
+
+    payload = {
+        "username": "newcomer",
+        "email": "newcomer@example.com",
+        "first_name": "New",
+        "last_name": "Comer",
+        "role": "talent",
+        "password": "secret-pass-123",
+        "password_confirm": "secret-pass-123",
+    }
+
+    def setUp(self):
+        patcher = mock.patch("api.views.send_email_verification")
+        self.task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def register(self):
+        return self.client.post("/api/auth/register/", self.payload, format="json")
+
+    def test_email_is_queued_after_commit(self):
+        """Test that the task is queued with the new user's id when the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.register()
+
+        self.assertEqual(response.status_code, 201)
+        self.task.delay.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        self.task.delay.assert_called_once_with(User.objects.get(username="newcomer").pk)
+
+    def test_queue_failure_does_not_fail_registration(self):
+        """Test that a broker error is logged and the user is still registered."""
+        self.task.delay.side_effect = RuntimeError("broker down")
+
+        with self.assertLogs("api.views", level="ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.register()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.filter(username="newcomer").exists())
+
+    def test_invalid_registration_queues_nothing(self):
+        """Test that a rejected registration schedules no email."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(
+                "/api/auth/register/", {**self.payload, "password_confirm": "different"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(callbacks, [])
+        self.task.delay.assert_not_called()
@@ -0,0 +1,60 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from address.models import Country, State
+from core.renderers import ORJSONRenderer
+
+
+class TestORJSONRenderer(SimpleTestCase):
+    """Test that ORJSONRenderer produces the same JSON as DRF's JSONRenderer."""
+
+    def assertRendersLikeDRF(self, data):
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_plain_lookup_payload(self):
+        """Test the list of value dicts returned by the lookup endpoints."""
+        self.assertRendersLikeDRF([{"id": 1, "name": "Kenya", "code": "KE"}, {"id": 2, "name": "São Tomé", "code": None}])
+
+    def test_types_deferred_to_drf_encoder(self):
+        """Test that types orjson does not encode natively fall back to DRF's encoder."""
+        self.assertRendersLikeDRF(
+            {
+                "price": Decimal("12.50"),
+                "when": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+                "day": datetime.date(2024, 1, 2),
+                "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            }
+        )
+
+    def test_non_string_keys(self):
+        """Test that integer keys are rendered as strings."""
+        self.assertEqual(json.loads(ORJSONRenderer().render({1: "a"})), {"1": "a"})
+
+    def test_none_renders_empty_body(self):
+        """Test that no data renders an empty body, as JSONRenderer does."""
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class TestLookupRendering(APITestCase):
+    """Test that a lookup endpoint serves its payload through ORJSONRenderer."""
+
+    def test_states_lookup_is_rendered_with_orjson(self):
+        """Test GET /api/addresses/lookup/states/ returns JSON from the orjson renderer."""
+        country = Country.objects.create(name="Kenya", code="KE")
+        state = State.objects.create(name="Nairobi County", country=country)
+
+        response = self.client.get("/api/addresses/lookup/states/", {"country_id": country.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), [{"id": state.pk, "name": "Nairobi County", "country_id": country.pk}])
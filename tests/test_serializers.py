@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework import serializers
+
+from address.models import City, Country, State
+from address.serializers import CityLookupSerializer
+from core.serializers import CachedFieldsModelSerializer
+
+
+class TestCachedFieldsModelSerializer(TestCase):
+    """Test that CachedFieldsModelSerializer builds its fields once per class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="Kenya", code="KE")
+        state = State.objects.create(name="Nairobi County", country=country)
+        City.objects.bulk_create(City(name=name, state=state) for name in ("Nairobi", "Thika"))
+
+    def make_serializer_class(self):
+        class StateSerializer(CachedFieldsModelSerializer):
+            country_name = serializers.CharField(source="country.name", read_only=True)
+
+            class Meta:
+                model = State
+                fields = ("id", "name", "country_name")
+                read_only_fields = fields
+
+        return StateSerializer
+
+    def test_fields_are_built_once_per_class(self):
+        """Test that ModelSerializer.get_fields runs only for the first instance."""
+        serializer_class = self.make_serializer_class()
+
+        with mock.patch.object(
+            serializers.ModelSerializer, "get_fields", autospec=True, side_effect=serializers.ModelSerializer.get_fields
+        ) as get_fields:
+            for _ in range(3):
+                serializer_class().fields
+
+        self.assertEqual(get_fields.call_count, 1)
+
+    def test_each_instance_binds_its_own_fields(self):
+        """Test that instances get separate field objects bound to themselves."""
+        serializer_class = self.make_serializer_class()
+        first, second = serializer_class(), serializer_class()
+
+        self.assertIsNot(first.fields["name"], second.fields["name"])
+        self.assertIs(first.fields["name"].parent, first)
+        self.assertIs(second.fields["name"].parent, second)
+
+    def test_subclasses_do_not_share_the_cache(self):
+        """Test that a subclass builds its own fields rather than reusing its parent's."""
+        parent = self.make_serializer_class()
+
+        class ChildSerializer(parent):
+            class Meta(parent.Meta):
+                fields = ("id", "name")
+                read_only_fields = fields
+
+        parent().fields
+
+        self.assertEqual(list(ChildSerializer().fields), ["id", "name"])
+        self.assertEqual(list(parent().fields), ["id", "name", "country_name"])
+
+    def test_output_matches_model_serializer(self):
+        """Test that many=True output is the same as a plain ModelSerializer's."""
+
+        class PlainCitySerializer(serializers.ModelSerializer):
+            state_name = serializers.CharField(source="state.name", read_only=True)
+            country_name = serializers.CharField(source="state.country.name", read_only=True)
+
+            class Meta(CityLookupSerializer.Meta):
+                pass
+
+        queryset = City.objects.select_related("state__country").order_by("id")
+
+        for _ in range(2):
+            self.assertEqual(CityLookupSerializer(queryset, many=True).data, PlainCitySerializer(queryset, many=True).data)
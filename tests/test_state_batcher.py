@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from address.batchers import StateBatcher
+
+
+class RecordingStateBatcher(StateBatcher):
+    """StateBatcher that answers from memory and records each batched query"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = []
+        self.queries_lock = threading.Lock()
+
+    def _fetch(self, country_ids):
+        with self.queries_lock:
+            self.queries.append(sorted(country_ids))
+        return {
+            country_id: [{"id": country_id * 10, "name": f"State {country_id}", "country_id": country_id}]
+            for country_id in country_ids
+        }
+
+
+class TestStateBatcher(SimpleTestCase):
+    """Test that StateBatcher coalesces lookups per event loop."""
+
+    def test_concurrent_loads_share_one_query(self):
+        """Test that loads issued together on one loop are answered by a single query."""
+        batcher = RecordingStateBatcher(window=0.01)
+
+        async def load_all():
+            return await asyncio.gather(batcher.load(1), batcher.load(2), batcher.load(1))
+
+        results = asyncio.run(load_all())
+
+        self.assertEqual(batcher.queries, [[1, 2]])
+        self.assertEqual([states[0]["country_id"] for states in results], [1, 2, 1])
+
+    def test_max_batch_size_flushes_early(self):
+        """Test that reaching max_batch_size dispatches without waiting for the window."""
+        batcher = RecordingStateBatcher(window=60, max_batch_size=2)
+
+        async def load_all():
+            return await asyncio.wait_for(asyncio.gather(batcher.load(1), batcher.load(2)), timeout=5)
+
+        asyncio.run(load_all())
+
+        self.assertEqual(batcher.queries, [[1, 2]])
+
+    def test_dispatch_task_is_held_until_done(self):
+        """Test that the batch keeps a reference to its in-flight dispatch task and drops it once done."""
+        batcher = RecordingStateBatcher(window=0.01)
+
+        async def load_and_watch():
+            load = asyncio.ensure_future(batcher.load(1))
+            batch = batcher._get_batch(asyncio.get_running_loop())
+            while not batch.dispatch_tasks and not load.done():
+                await asyncio.sleep(0)
+            in_flight = len(batch.dispatch_tasks)
+            await load
+            # Let the done callback run
+            await asyncio.sleep(0)
+            return in_flight, len(batch.dispatch_tasks)
+
+        self.assertEqual(asyncio.run(load_and_watch()), (1, 0))
+
+    def test_concurrent_event_loops_are_batched_separately(self):
+        """Test that two loops running at once in different threads each get their own batch."""
+        batcher = RecordingStateBatcher(window=0.05)
+        # Both loops have loads pending before either window closes
+        barrier = threading.Barrier(2)
+        results, errors = {}, []
+
+        def run_loop(name, country_ids):
+            async def load_all():
+                barrier.wait(timeout=5)
+                return await asyncio.wait_for(
+                    asyncio.gather(*(batcher.load(country_id) for country_id in country_ids)), timeout=5
+                )
+
+            try:
+                results[name] = asyncio.run(load_all())
+            except Exception as e:  # surfaced to the main thread below
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=run_loop, args=("first", [1, 2])),
+            threading.Thread(target=run_loop, args=("second", [2, 3])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual([states[0]["country_id"] for states in results["first"]], [1, 2])
+        self.assertEqual([states[0]["country_id"] for states in results["second"]], [2, 3])
+        self.assertCountEqual(batcher.queries, [[1, 2], [2, 3]])
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0003_alter_upload_file_path_alter_upload_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['uploaded_by', 'type', '-created_at'], name='upload_user_type_recent_idx'),
+        ),
+    ]
@@ -59,6 +59,12 @@ class Upload(models.Model):
     # Created at of the upload
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves "the user's most recent upload of a type", e.g. the resume attached to applications
+            models.Index(fields=["uploaded_by", "type", "-created_at"], name="upload_user_type_recent_idx"),
+        ]
+
     def __str__(self):
         """
         String representation of the upload model